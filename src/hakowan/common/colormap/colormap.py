@@ -40,6 +40,34 @@ class ColorMap:
         c = c0 * (1 - t) + c1 * t
         return Color(*c)
 
+    def evaluate(self, values: npt.ArrayLike) -> npt.NDArray:
+        """Evaluate color map at an array of values between 0 and 1.
+
+        This is the vectorized version of `__call__`.
+
+        Args:
+            values: An array of n values between 0 and 1.
+
+        Returns:
+            (npt.NDArray): The interpolated colors as an array of shape (n, 3).
+        """
+        data = np.asarray(values)
+        if not np.issubdtype(data.dtype, np.floating):
+            data = data.astype(np.float64)
+        data = np.clip(data.ravel(), 0.0, 1.0)
+
+        n = len(self.samples) - 1
+        v = n * data
+        i0 = np.floor(v)
+        i1 = np.ceil(v)
+
+        t = (v - i0)[:, None]
+        samples = np.asarray(self.samples)
+        c0 = samples[i0.astype(np.int64)]
+        c1 = samples[i1.astype(np.int64)]
+
+        return c0 * (1 - t) + c1 * t
+
     def num_colors(self):
         """Number of color samples stored in this color map.
 
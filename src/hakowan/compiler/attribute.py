@@ -168,7 +168,16 @@ def _apply_normalize(data: npt.NDArray, scale: Normalize):
             # Avoid divide by zero.
             domain_size = 1
 
-    data[:] = (data - domain_center) / domain_size * range_size + range_center
+    normalized = data - domain_center
+    if normalized.dtype == np.float64:
+        # Nothing can promote a float64 array further, so the remaining steps are done in place
+        # instead of allocating a temporary array per operation.
+        normalized /= domain_size
+        normalized *= range_size
+        normalized += range_center
+    else:
+        normalized = normalized / domain_size * range_size + range_center
+    data[:] = normalized
     assert np.all(np.isfinite(data))
 
 
@@ -200,8 +209,15 @@ def _apply_uniform(data: npt.NDArray, scale: Uniform):
 
 
 def _apply_custom(data: npt.NDArray, scale: Custom):
-    for i, entry in enumerate(data):
-        data[i] = scale.function(entry)
+    if scale.vectorized:
+        data[:] = scale.function(data)
+    elif data.ndim == 1:
+        data[:] = np.fromiter(
+            map(scale.function, data), dtype=data.dtype, count=len(data)
+        )
+    else:
+        for i, entry in enumerate(data):
+            data[i] = scale.function(entry)
 
 
 def _apply_affine(data: npt.NDArray, scale: Affine):
@@ -9,6 +9,7 @@ from typing import Callable
 
 import lagrange
 import numpy as np
+import numpy.typing as npt
 
 
 def apply_colormap(df: DataFrame, tex: Texture):
@@ -26,6 +27,22 @@ def apply_colormap(df: DataFrame, tex: Texture):
     _apply_colormap(df, tex)
 
 
+def _identity_colors(values: npt.NDArray) -> npt.NDArray:
+    """Interpret attribute values directly as colors.
+
+    Scalar values are gray levels, and rows of 3 or 4 values are RGB(A) colors. The colors are
+    written once, directly in single precision.
+    """
+    values = np.asarray(values)
+    if values.ndim == 1:
+        colors = np.empty((len(values), 3), dtype=np.float32)
+        colors[:] = values[:, None]
+        return colors
+    if values.shape[1] not in (3, 4):
+        raise ValueError(f"Cannot convert values of shape {values.shape} to colors")
+    return np.array(values[:, :3], dtype=np.float32)
+
+
 def _apply_colormap_scalar_field(df: DataFrame, tex: ScalarField):
     assert isinstance(tex.data, Attribute)
     assert tex.data._internal_name is not None
@@ -33,32 +50,37 @@ def _apply_colormap_scalar_field(df: DataFrame, tex: ScalarField):
     attr_name = tex.data._internal_name
     assert mesh.has_attribute(attr_name)
 
-    def attr_to_color(colormap: Callable, categories: bool = False):
+    def attr_to_color(colormap: ColorMap | Callable, categories: bool = False):
+        """Convert the attribute to colors.
+
+        Args:
+            colormap: A color map, or a function mapping an array of n values to an (n, 3) array
+                of colors.
+            categories: Whether to treat the attribute values as categories.
+        """
         nonlocal mesh
         nonlocal attr_name
         nonlocal tex
 
-        unique_values: list[float] = []
-
-        def get_color(value: float):
-            if not categories:
-                return colormap(value).data
-            else:
-                assert len(unique_values) > 0
+        def get_colors(values: npt.NDArray):
+            """Map values to colors, stored in single precision as they are only consumed by the
+            renderer."""
+            if categories:
                 assert isinstance(colormap, ColorMap)
                 num_colors = colormap.num_colors()
-                return colormap(
-                    unique_values.index(value) % num_colors / (num_colors - 1)
-                ).data
+                _, category_index = np.unique(values, return_inverse=True)
+                values = category_index.ravel() % num_colors / (num_colors - 1)
+            if isinstance(colormap, ColorMap):
+                colors = colormap.evaluate(values)
+            else:
+                colors = colormap(values)
+            return np.asarray(colors, dtype=np.float32)
 
         if mesh.is_attribute_indexed(attr_name):
             attr = mesh.indexed_attribute(attr_name)
             value_attr = attr.values
             index_attr = attr.indices
-            if categories:
-                unique_values = np.unique(value_attr.data).tolist()
-
-            color_data = np.array([get_color(x) for x in value_attr.data])
+            color_data = get_colors(value_attr.data)
             color_attr_name = unique_name(mesh, "vertex_color")
 
             mesh.create_attribute(
@@ -70,9 +92,7 @@ def _apply_colormap_scalar_field(df: DataFrame, tex: ScalarField):
             )
         else:
             attr = mesh.attribute(attr_name)
-            if categories:
-                unique_values = np.unique(attr.data).tolist()
-            color_data = np.array([get_color(x) for x in attr.data])
+            color_data = get_colors(attr.data)
 
             if attr.element_type == lagrange.AttributeElement.Facet:
                 color_attr_name = unique_name(mesh, "face_color")
@@ -90,7 +110,7 @@ def _apply_colormap_scalar_field(df: DataFrame, tex: ScalarField):
 
     if tex.colormap == "identity":
         # Assuming attribute is already storing color data.
-        attr_to_color(lambda x: to_color(x.tolist()))
+        attr_to_color(_identity_colors)
     elif isinstance(tex.colormap, str):
         assert tex.colormap in named_colormaps
         colormap = named_colormaps[tex.colormap]
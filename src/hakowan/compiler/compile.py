@@ -1,5 +1,8 @@
 from ..common import logger
 from ..grammar import layer, mark
+from ..grammar.channel import Channel
+from ..grammar.dataframe import DataFrame
+from ..grammar.transform import Transform
 from .view import View
 from .scene import Scene
 from .transform import apply_transform
@@ -8,29 +11,57 @@ from .channel import preprocess_channels, process_channels
 import copy
 
 
+def chain_transforms(transforms: list[Transform]) -> Transform | None:
+    """Copy and compose a list of transforms in a single pass.
+
+    :param transforms: Transforms ordered from the root layer to a leaf layer.
+
+    :return: The composed transform chain, which shares no data with the input transforms. Each
+             transform is the parent of the next one in the list. Since `apply_transform` applies
+             the child of a transform before the transform itself, the leaf layer's transform is
+             applied first and the root layer's transform last.
+    """
+    if len(transforms) <= 1:
+        # Common case of a single layer specifying a transform (or none): nothing to link.
+        return copy.deepcopy(transforms[0]) if transforms else None
+
+    head: Transform | None = None
+    tail: Transform | None = None
+    for t in transforms:
+        t = copy.deepcopy(t)
+        if tail is None:
+            head = t
+        else:
+            tail._child = t
+        tail = t
+        while tail._child is not None:
+            tail = tail._child
+    return head
+
+
 def condense_layer_tree_to_scene(root: layer.Layer) -> Scene:
     scene = Scene()
 
-    def generate_view(ancestors: list[layer.Layer]) -> View:
+    # Channels and transforms of all layers from the root to the current layer.
+    channels: list[Channel] = []
+    transforms: list[Transform] = []
+
+    def generate_view(data: DataFrame | None, view_mark: mark.Mark | None) -> View:
         """ Generate a view from a path in the layer tree.
 
-        :param ancestors: A list of layers from the root layer to a leaf layer. Layers closer to the
-                          root have precedence over layers closer to the leaf.
+        Layers closer to the root have precedence over layers closer to the leaf.
+
+        :param data:      The data frame of the layer closest to the root that specifies one.
+        :param view_mark: The mark of the layer closest to the root that specifies one.
 
         :return: a view.
         """
-        view = View()
-        for l in ancestors:
-            if view.data_frame is None:
-                view.data_frame = copy.deepcopy(l._spec.data)
-            if view.mark is None:
-                view.mark = l._spec.mark
-            if view.transform is None:
-                view.transform = copy.deepcopy(l._spec.transform)
-            elif l._spec.transform is not None:
-                view.transform *= l._spec.transform
-            if len(l._spec.channels) > 0:
-                view.channels.extend(copy.deepcopy(l._spec.channels))
+        view = View(
+            data_frame=copy.deepcopy(data),
+            mark=view_mark,
+            transform=chain_transforms(transforms),
+            channels=copy.deepcopy(channels),
+        )
 
         if view.mark is None:
             logger.debug("Apply default surface mark.")
@@ -40,17 +71,40 @@ def condense_layer_tree_to_scene(root: layer.Layer) -> Scene:
         view.initialize_bbox()
         return view
 
-    def traverse(l: layer.Layer, ancestors: list[layer.Layer]) -> None:
-        # `ancestors` is a list of layers from the root to the current layer.
-        ancestors.append(l)
+    # Explicit work stack of (layer, data, mark) entries to visit. A `None` layer marks the exit
+    # of a layer, at which point the channels and transform it added are removed again. This
+    # avoids one Python frame per layer and the recursion limit on deep layer trees.
+    stack: list[tuple[layer.Layer | None, DataFrame | None, mark.Mark | None]] = [
+        (root, None, None)
+    ]
+    # Channel count and whether a transform was added, for each layer currently entered.
+    exits: list[tuple[int, bool]] = []
+    while stack:
+        l, data, view_mark = stack.pop()
+        if l is None:
+            num_channels, has_transform = exits.pop()
+            del channels[num_channels:]
+            if has_transform:
+                transforms.pop()
+            continue
+
+        if data is None:
+            data = l._spec.data
+        if view_mark is None:
+            view_mark = l._spec.mark
+
+        exits.append((len(channels), l._spec.transform is not None))
+        channels.extend(l._spec.channels)
+        if l._spec.transform is not None:
+            transforms.append(l._spec.transform)
+        stack.append((None, None, None))
+
         if len(l._children) == 0:
-            scene.append(generate_view(ancestors))
-        else:
-            for child in l._children:
-                traverse(child, ancestors)
-        ancestors.pop()
+            scene.append(generate_view(data, view_mark))
+            continue
+        # Push children in reverse so that they are visited in order.
+        stack.extend((child, data, view_mark) for child in reversed(l._children))
 
-    traverse(root, [])
     return scene
 
 
@@ -6,7 +6,7 @@ from numpy.linalg import norm
 from .view import View
 
 
-@dataclass
+@dataclass(slots=True)
 class Scene:
     views: list[View] = field(default_factory=list)
 
@@ -40,24 +40,14 @@ class Scene:
         if len(self.views) == 0:
             return
 
-        bbox_min = None
-        bbox_max = None
-        for view in self.views:
-            if view.bbox is None:
-                continue
-            bbox_min = view.bbox[0]
-            bbox_max = view.bbox[1]
-            break
-
-        if bbox_min is None or bbox_max is None:
+        # Stack the bounding boxes of all non-empty views, shape (k, 2, 3), and reduce them at once.
+        bboxes = [view.bbox for view in self.views if view.bbox is not None]
+        if len(bboxes) == 0:
             # Data in all views are empty.
             return
-
-        for view in self.views:
-            if view.bbox is None:
-                continue
-            np.minimum(bbox_min, view.bbox[0], out=bbox_min)
-            np.maximum(bbox_max, view.bbox[1], out=bbox_max)
+        bboxes = np.asarray(bboxes)
+        bbox_min = bboxes[:, 0].min(axis=0)
+        bbox_max = bboxes[:, 1].max(axis=0)
 
         bbox_center = (bbox_min + bbox_max) / 2
         translation = np.eye(4)
@@ -44,7 +44,15 @@ def _apply_filter_transform(view: View, transform: Filter):
         attr_name
     ), f"Attribute {attr_name} does not exist in data"
     attr = mesh.attribute(attr_name)
-    keep = [transform.condition(value) for value in attr.data]
+    if transform.vectorized:
+        keep = np.asarray(transform.condition(attr.data), dtype=bool)
+        assert keep.shape == (
+            len(attr.data),
+        ), "Vectorized condition must return n booleans"
+    else:
+        keep = np.fromiter(
+            map(transform.condition, attr.data), dtype=bool, count=len(attr.data)
+        )
 
     match (attr.element_type):
         case lagrange.AttributeElement.Facet:
@@ -307,7 +315,8 @@ def _apply_boundary_transform(view: View, transform: Boundary):
 
 def apply_transform(view: View):
     """Apply a chain of transforms specified by view.transform to view.data_frame.
-    Transforms are applied in the order specified by the chain.
+    The child of each transform in the chain is applied before the transform itself, i.e. the
+    transform of the layer closest to the leaf is applied first.
     """
 
     def _apply(t: Transform | None):
@@ -22,7 +22,7 @@ import numpy as np
 import numpy.typing as npt
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class View:
     data_frame: DataFrame | None = None
     mark: Mark | None = None
@@ -77,12 +77,13 @@ class View:
             if mesh.num_vertices == 0:
                 return
 
-            vertices = mesh.vertices
-            vertices = (
-                self.global_transform[:3, :3] @ vertices.T
-            ).T + self.global_transform[:3, 3].T
-            bbox_min = np.amin(vertices, axis=0)
-            bbox_max = np.amax(vertices, axis=0)
+            # Transformed coordinates are laid out as a contiguous (3, n) array, so that each
+            # coordinate is reduced along a contiguous row. The translation does not change which
+            # vertex is extremal, so it is only applied to the reduced values.
+            coords = self.global_transform[:3, :3] @ mesh.vertices.T
+            translation = self.global_transform[:3, 3]
+            bbox_min = np.amin(coords, axis=1) + translation
+            bbox_max = np.amax(coords, axis=1) + translation
             self.bbox = np.stack([bbox_min, bbox_max])
 
     def validate(self):
@@ -99,6 +99,8 @@ class Covariance(Channel):
         full: (bool): If True, the full covariance matrix is stored in the attribute.
             If False, its "square root", M, is stored. The full covariance matrix is ∑ := M @ M^T.
             The matrix M represenst the stretch and rotation transform applied on each mark.
+            A full covariance matrix can also be stored in packed form as 6 values per vertex,
+            (∑00, ∑11, ∑22, ∑10, ∑20, ∑21), since it is symmetric.
     """
 
     data: AttributeLike
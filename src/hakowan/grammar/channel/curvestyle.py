@@ -3,14 +3,14 @@ from dataclasses import dataclass
 from ..scale import AttributeLike
 
 
-@dataclass
+@dataclass(slots=True)
 class CurveStyle:
     """Curve style base class."""
 
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Bend(CurveStyle):
     """ Curve bending style.
 
@@ -33,11 +33,16 @@ from ..texture import TextureLike
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, Sequence
+import itertools
 import lagrange
 import numpy as np
 import numpy.typing as npt
 
 
+# Global counter used to stamp layers with a unique version upon creation and modification.
+_version_counter = itertools.count()
+
+
 @dataclass(kw_only=True, slots=True)
 class Layer:
     """Layer contains the specification of data, mark, channels and transform.
@@ -48,6 +53,7 @@ class Layer:
 
     _spec: LayerSpec = field(default_factory=LayerSpec)
     _children: list["Layer"] = field(default_factory=list)
+    _version: int = field(default=0, compare=False, repr=False)
 
     def __init__(
         self,
@@ -71,6 +77,7 @@ class Layer:
         """
         self._spec = LayerSpec()
         self._children = []
+        self._version = next(_version_counter)
 
         if data is not None:
             self.data(data, in_place=True)
@@ -96,6 +103,7 @@ class Layer:
 
     def __get_working_layer(self, in_place: bool = False) -> "Layer":
         if in_place:
+            self._version = next(_version_counter)
             return self
         else:
             l = Layer()
@@ -379,3 +387,18 @@ class Layer:
     def children(self, value: Sequence["Layer"]) -> None:
         """Set the child layers of this layer."""
         self._children = list(value)
+        self._version = next(_version_counter)
+
+    @property
+    def signature(self) -> tuple:
+        """A signature of the layer tree rooted at this layer.
+
+        The signature changes whenever any layer in the tree is modified through the layer API.
+        Note that in-place modifications of the underlying data (e.g. mesh vertices) are not
+        tracked.
+        """
+        return (
+            id(self),
+            self._version,
+            tuple(child.signature for child in self._children),
+        )
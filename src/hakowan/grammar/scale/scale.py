@@ -78,9 +78,13 @@ class Custom(Scale):
 
     Attributes:
         function: The scaling function. E.g. `lambda x: x ** 2` for squaring the data.
+        vectorized: Whether `function` can be applied to all entries at once. If True, it is
+            called a single time with the whole data array (of shape (n,) or (n, dim)) instead of
+            once per entry.
     """
 
     function: Callable
+    vectorized: bool = False
 
 
 @dataclass(slots=True)
@@ -1,4 +1,4 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Callable, Optional
 import copy
 import numpy.typing as npt
@@ -6,6 +6,23 @@ import numpy.typing as npt
 from ..scale import Attribute, AttributeLike
 
 
+def _fast_clone(t: "Transform") -> "Transform":
+    """Clone a transform chain without going through `copy.deepcopy`.
+
+    Nested transforms are cloned recursively and lists are shallow copied. All other fields
+    (e.g. attributes, affine matrices and filter conditions) are treated as immutable and shared.
+    """
+    r = object.__new__(type(t))
+    for f in fields(t):
+        v = getattr(t, f.name)
+        if isinstance(v, Transform):
+            v = _fast_clone(v)
+        elif isinstance(v, list):
+            v = list(v)
+        setattr(r, f.name, v)
+    return r
+
+
 @dataclass(kw_only=True, slots=True)
 class Transform:
     """Transform is the base class of all transforms."""
@@ -19,14 +36,14 @@ class Transform:
             other: The transform to apply after the current transform.
         """
         # Because transform may be used in multiple places in the layer graph, and it may have a
-        # child in the future, it must be deep copied to avoid undesired side effects.
+        # child in the future, it must be cloned to avoid undesired side effects.
         if self._child is None:
-            self._child = copy.deepcopy(other)
+            self._child = _fast_clone(other)
         else:
             t = self._child
             while t._child is not None:
                 t = t._child
-            t._child = copy.deepcopy(other)
+            t._child = _fast_clone(other)
         return self
 
     def __mul__(self, other: "Transform") -> "Transform":
@@ -50,10 +67,14 @@ class Filter(Transform):
         data: The attribute to filter on. If None, the vertex position is used.
         condition: A callable that takes a single argument, the value of the attribute, and returns
             a boolean indicating whether the data should be kept.
+        vectorized: Whether `condition` can be applied to all values at once. If True, it is
+            called a single time with the whole attribute array (of shape (n,) or (n, dim)) and
+            must return a boolean array of length n.
     """
 
     data: AttributeLike | None = None
     condition: Callable = lambda x: True
+    vectorized: bool = False
 
 
 @dataclass(slots=True)
@@ -1,14 +1,12 @@
-from .render import render
-from ..common import logger
+def render(*args, **kwargs):
+    """Render a layer tree. See `hakowan.render.render.render` for the full documentation.
 
-import mitsuba as mi
+    Mitsuba is imported and its variant is selected upon the first call rather than at import time.
+    """
+    global render
+    from .render import render as _render
 
-if mi.variant() is None:
-    for variant in ["scalar_rgb", "cuda_ad_rgb", "llvm_ad_rgb"]:
-        if variant in mi.variants():
-            try:
-                mi.set_variant(variant)
-                break
-            except:
-                pass
-    assert mi.variant() is not None
+    # Importing the `render` submodule binds it as the `render` attribute of this package, which
+    # shadows this function. Rebind the attribute to the render function itself.
+    render = _render
+    return _render(*args, **kwargs)
@@ -1,59 +1,64 @@
+import functools
 import numpy as np
+import numpy.typing as npt
 import lagrange
 
 
-def refine_triangles(vertices: list, triangles: list):
+def refine_triangles(vertices: npt.NDArray, triangles: npt.NDArray):
     """Refine triangles by adding midpoints to edges.
 
+    Each triangle is split into 4 triangles, and the edge midpoints are projected onto the unit
+    sphere.
+
     Args:
-        vertices (list): Array of vertices.
-        triangles (list): List of triangles.
+        vertices (npt.NDArray): Array of vertices of shape (n, 3).
+        triangles (npt.NDArray): Array of triangles of shape (m, 3).
+
+    Returns:
+        tuple[npt.NDArray, npt.NDArray]: The refined vertices and triangles.
     """
-    new_vertices = vertices
-    new_triangles = []
-
-    edge_midpoints: dict[
-        tuple[int, int], int
-    ] = {}  # Store midpoints of edges to avoid duplication
-
-    def get_midpoint(v1, v2):
-        if (v1, v2) in edge_midpoints:
-            return edge_midpoints[(v1, v2)]
-        elif (v2, v1) in edge_midpoints:
-            return edge_midpoints[(v2, v1)]
-        else:
-            p1 = np.array(vertices[v1])
-            p2 = np.array(vertices[v2])
-            midpoint = (p1 + p2) / 2
-            midpoint = midpoint / np.linalg.norm(midpoint)
-            midpoint_index = len(new_vertices)
-            new_vertices.append(midpoint)
-            edge_midpoints[(v1, v2)] = midpoint_index
-            return midpoint_index
-
-    for tri in triangles:
-        v1, v2, v3 = tri
-        midpoints = [get_midpoint(v1, v2), get_midpoint(v2, v3), get_midpoint(v3, v1)]
-        new_triangles.extend(
-            [
-                [v1, midpoints[0], midpoints[2]],
-                [v2, midpoints[1], midpoints[0]],
-                [v3, midpoints[2], midpoints[1]],
-                [midpoints[0], midpoints[1], midpoints[2]],
-            ]
-        )
+    vertices = np.asarray(vertices, dtype=np.float64)
+    triangles = np.asarray(triangles, dtype=np.uint32)
+    num_triangles = len(triangles)
+
+    # Gather all edges in the order of (v1, v2), (v2, v3), (v3, v1) and merge duplicates. Each
+    # edge is encoded as a single integer key so that np.unique works on a flat array.
+    edges = np.vstack(
+        [triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]]
+    )
+    edges.sort(axis=1)
+    num_vertices = np.uint64(len(vertices))
+    keys = edges[:, 0].astype(np.uint64) * num_vertices + edges[:, 1]
+    unique_keys, edge_index = np.unique(keys, return_inverse=True)
+    edge_v0, edge_v1 = np.divmod(unique_keys, num_vertices)
+
+    midpoints = (vertices[edge_v0] + vertices[edge_v1]) / 2
+    midpoints /= np.linalg.norm(midpoints, axis=1)[:, None]
+    new_vertices = np.vstack([vertices, midpoints])
+
+    m0, m1, m2 = (edge_index.reshape(3, num_triangles) + len(vertices)).astype(
+        np.uint32
+    )
+    v1, v2, v3 = triangles.T
+    new_triangles = np.stack(
+        [
+            np.stack([v1, m0, m2], axis=1),
+            np.stack([v2, m1, m0], axis=1),
+            np.stack([v3, m2, m1], axis=1),
+            np.stack([m0, m1, m2], axis=1),
+        ],
+        axis=1,
+    ).reshape(-1, 3)
 
     return new_vertices, new_triangles
 
 
-def create_icosphere(refinement_level):
-    """Generate icosphere centered at the origin with radius 1.
-
-    Args:
-        refinement_level (int): Number of times to refine the icosphere.
+@functools.lru_cache(maxsize=8)
+def _icosphere_arrays(refinement_level: int) -> tuple[npt.NDArray, npt.NDArray]:
+    """Compute the vertices and triangles of an icosphere.
 
-    Returns:
-        lagrange.SurfaceMesh: The generated icosphere mesh.
+    The result is cached per refinement level. The returned arrays are read-only since they are
+    shared across calls.
     """
     phi = (1 + np.sqrt(5)) / 2
     vertices = np.array(
@@ -73,41 +78,59 @@ def create_icosphere(refinement_level):
         ]
     )
     vertices = vertices / np.linalg.norm(vertices, axis=1)[:, None]
-    vertices = vertices.tolist()
-
-    triangles = [
-        (0, 11, 5),
-        (0, 5, 1),
-        (0, 1, 7),
-        (0, 7, 10),
-        (0, 10, 11),
-        (2, 11, 10),
-        (4, 5, 11),
-        (9, 1, 5),
-        (8, 7, 1),
-        (6, 10, 7),
-        (4, 9, 5),
-        (9, 8, 1),
-        (8, 6, 7),
-        (6, 2, 10),
-        (2, 4, 11),
-        (3, 9, 4),
-        (3, 4, 2),
-        (3, 2, 6),
-        (3, 6, 8),
-        (3, 8, 9),
-    ]
+
+    triangles = np.array(
+        [
+            (0, 11, 5),
+            (0, 5, 1),
+            (0, 1, 7),
+            (0, 7, 10),
+            (0, 10, 11),
+            (2, 11, 10),
+            (4, 5, 11),
+            (9, 1, 5),
+            (8, 7, 1),
+            (6, 10, 7),
+            (4, 9, 5),
+            (9, 8, 1),
+            (8, 6, 7),
+            (6, 2, 10),
+            (2, 4, 11),
+            (3, 9, 4),
+            (3, 4, 2),
+            (3, 2, 6),
+            (3, 6, 8),
+            (3, 8, 9),
+        ],
+        dtype=np.uint32,
+    )
 
     for i in range(refinement_level):
         vertices, triangles = refine_triangles(vertices, triangles)
 
+    vertices.setflags(write=False)
+    triangles.setflags(write=False)
+    return vertices, triangles
+
+
+def create_icosphere(refinement_level):
+    """Generate icosphere centered at the origin with radius 1.
+
+    Args:
+        refinement_level (int): Number of times to refine the icosphere.
+
+    Returns:
+        lagrange.SurfaceMesh: The generated icosphere mesh.
+    """
+    vertices, triangles = _icosphere_arrays(refinement_level)
+
     icosphere = lagrange.SurfaceMesh()
-    icosphere.add_vertices(np.array(vertices, dtype=np.float64))
-    icosphere.add_triangles(np.array(triangles, dtype=np.uint32))
+    icosphere.add_vertices(vertices.copy())
+    icosphere.add_triangles(triangles.copy())
     icosphere.create_attribute(
         "vertex_normal",
         usage=lagrange.AttributeUsage.Normal,
-        initial_values=np.array(vertices, dtype=np.float64),
+        initial_values=vertices.copy(),
     )
     return icosphere
 
@@ -17,11 +17,24 @@ from ..grammar.channel.material import (
     ThinPrincipled,
 )
 from ..grammar.channel import BumpMap, NormalMap
-from ..grammar.texture import Texture
-from ..common.color import ColorLike
+from ..grammar.texture import Texture, TextureLike, Uniform
+from ..common.color import Color, ColorLike
+from ..common.to_color import to_color
 
-from typing import Any
+from functools import partial
+from typing import Any, Callable, Iterator
 import lagrange
+import numpy as np
+
+# Texture configs generated for a single view, keyed by `(id(mesh), id(tex), is_color,
+# is_primitive)`. It is created by `generate_bsdf_config` and passed down to the generators. All
+# keyed objects are kept alive by the view, so the ids cannot be recycled while it is in use.
+TextureConfigs = dict[tuple[int, int, bool, bool], Any]
+
+
+def _primitive_keys(n: int) -> Iterator[str]:
+    """Keys of the per-primitive bsdf configs for `n` primitives, generated lazily."""
+    return (f"bsdf_{i:06}" for i in range(n))
 
 
 def generate_float_color_texture_config(
@@ -29,6 +42,7 @@ def generate_float_color_texture_config(
     tex: ColorLike | Texture,
     is_color: bool = False,
     is_primitive: bool = False,
+    texture_configs: TextureConfigs | None = None,
 ):
     match tex:
         case float() | int():
@@ -37,25 +51,36 @@ def generate_float_color_texture_config(
             assert is_color
             return generate_color_config(tex)
         case Texture():
-            return generate_texture_config(mesh, tex, is_color, is_primitive)
+            if texture_configs is None:
+                return generate_texture_config(mesh, tex, is_color, is_primitive)
+            key = (id(mesh), id(tex), is_color, is_primitive)
+            if key not in texture_configs:
+                texture_configs[key] = generate_texture_config(
+                    mesh, tex, is_color, is_primitive
+                )
+            return texture_configs[key]
         case _:
             raise NotImplementedError(f"Unsupported type: {type(tex)}")
 
 
 def generate_diffuse_bsdf_config(
-    mesh: lagrange.SurfaceMesh, mat: Diffuse, is_primitive
+    mesh: lagrange.SurfaceMesh,
+    mat: Diffuse,
+    is_primitive,
+    texture_configs: TextureConfigs | None = None,
 ):
     reflectance = generate_float_color_texture_config(
-        mesh, mat.reflectance, True, is_primitive
+        mesh, mat.reflectance, True, is_primitive, texture_configs
     )
     mi_config: dict[str, Any]
     if is_primitive and "colors" in reflectance:
+        colors = reflectance["colors"]
         mi_config = {
-            f"bsdf_{i:06}": {
+            key: {
                 "type": "diffuse",
                 "reflectance": generate_color_config(color),
             }
-            for i, color in enumerate(reflectance["colors"])
+            for key, color in zip(_primitive_keys(len(colors)), colors)
         }
     else:
         mi_config = {"type": "diffuse", "reflectance": reflectance}
@@ -71,38 +96,50 @@ def generate_conductor_bsdf_config(mesh: lagrange.SurfaceMesh, mat: Conductor):
 
 
 def generate_rough_conductor_bsdf_config(
-    mesh: lagrange.SurfaceMesh, mat: RoughConductor
+    mesh: lagrange.SurfaceMesh,
+    mat: RoughConductor,
+    texture_configs: TextureConfigs | None = None,
 ):
     mi_config: dict[str, Any] = {
         "type": "roughconductor",
         "material": mat.material,
         "distribution": mat.distribution,
-        "alpha": generate_float_color_texture_config(mesh, mat.alpha),
+        "alpha": generate_float_color_texture_config(
+            mesh, mat.alpha, texture_configs=texture_configs
+        ),
     }
     return mi_config
 
 
-def generate_plastic_bsdf_config(mesh: lagrange.SurfaceMesh, mat: Plastic):
+def generate_plastic_bsdf_config(
+    mesh: lagrange.SurfaceMesh,
+    mat: Plastic,
+    texture_configs: TextureConfigs | None = None,
+):
     mi_config: dict[str, Any] = {
         "type": "plastic",
         "diffuse_reflectance": generate_float_color_texture_config(
-            mesh, mat.diffuse_reflectance, True
+            mesh, mat.diffuse_reflectance, True, texture_configs=texture_configs
         ),
         "specular_reflectance": generate_float_color_texture_config(
-            mesh, mat.specular_reflectance
+            mesh, mat.specular_reflectance, texture_configs=texture_configs
         ),
     }
     return mi_config
 
 
-def generate_rough_plastic_bsdf_config(mesh: lagrange.SurfaceMesh, mat: RoughPlastic):
+def generate_rough_plastic_bsdf_config(
+    mesh: lagrange.SurfaceMesh,
+    mat: RoughPlastic,
+    texture_configs: TextureConfigs | None = None,
+):
     mi_config: dict[str, Any] = {
         "type": "roughplastic",
         "diffuse_reflectance": generate_float_color_texture_config(
-            mesh, mat.diffuse_reflectance, True
+            mesh, mat.diffuse_reflectance, True, texture_configs=texture_configs
         ),
         "specular_reflectance": generate_float_color_texture_config(
-            mesh, mat.specular_reflectance
+            mesh, mat.specular_reflectance, texture_configs=texture_configs
         ),
         "distribution": mat.distribution,
         "alpha": mat.alpha,
@@ -111,43 +148,46 @@ def generate_rough_plastic_bsdf_config(mesh: lagrange.SurfaceMesh, mat: RoughPla
 
 
 def generate_principled_bsdf_config(
-    mesh: lagrange.SurfaceMesh, mat: Principled, is_primitive: bool, thin: bool = False
+    mesh: lagrange.SurfaceMesh,
+    mat: Principled,
+    is_primitive: bool,
+    texture_configs: TextureConfigs | None = None,
+    thin: bool = False,
 ):
     # Extract color, roughness, metallic
-    colors = generate_float_color_texture_config(mesh, mat.color, True, is_primitive)
+    colors = generate_float_color_texture_config(
+        mesh, mat.color, True, is_primitive, texture_configs
+    )
     roughness = generate_float_color_texture_config(
-        mesh, mat.roughness, False, is_primitive
+        mesh, mat.roughness, False, is_primitive, texture_configs
     )
     metallic = generate_float_color_texture_config(
-        mesh, mat.metallic, False, is_primitive
+        mesh, mat.metallic, False, is_primitive, texture_configs
     )
 
     n: int | None = None
 
-    # Check size and generate getters
+    # Resolve per-primitive data once.
+    color_list = None
     if isinstance(colors, dict) and "colors" in colors:
-        n = len(colors["colors"])
-        get_color = lambda i: generate_color_config(colors["colors"][i])
-    else:
-        get_color = lambda i: colors
+        color_list = colors["colors"]
+        n = len(color_list)
 
+    roughness_list = None
     if isinstance(roughness, dict) and "values" in roughness:
+        roughness_list = roughness["values"]
         if n is None:
-            n = len(roughness["values"])
+            n = len(roughness_list)
         else:
-            assert n == len(roughness["values"])
-        get_roughness = lambda i: roughness["values"][i]
-    else:
-        get_roughness = lambda i: roughness
+            assert n == len(roughness_list)
 
+    metallic_list = None
     if isinstance(metallic, dict) and "values" in metallic:
+        metallic_list = metallic["values"]
         if n is None:
-            n = len(metallic["values"])
+            n = len(metallic_list)
         else:
-            assert n == len(metallic["values"])
-        get_metallic = lambda i: metallic["values"][i]
-    else:
-        get_metallic = lambda i: metallic
+            assert n == len(metallic_list)
 
     mat_name = "principled" if not thin else "principledthin"
     base_config: dict[str, Any] = {
@@ -163,23 +203,33 @@ def generate_principled_bsdf_config(
         assert isinstance(mat, ThinPrincipled)
         base_config["diff_trans"] = mat.diff_trans
     if n is None:
+        # No per-primitive data, so the configs generated above apply to the whole shape.
         mi_config: dict[str, Any] = {
             "type": mat_name,
-            "base_color": generate_float_color_texture_config(mesh, mat.color, True),
-            "roughness": generate_float_color_texture_config(mesh, mat.roughness),
-            "metallic": generate_float_color_texture_config(mesh, mat.metallic),
+            "base_color": colors,
+            "roughness": roughness,
+            "metallic": metallic,
         } | base_config
     else:
-        mi_config = {
-            f"bsdf_{i:06}": {
-                "type": mat_name,
-                "base_color": get_color(i),
-                "roughness": get_roughness(i),
-                "metallic": get_metallic(i),
-            }
-            | base_config
-            for i in range(n)
+        # All per-primitive configs share the same layout, so they are copied from a prebuilt
+        # template and only the per-primitive entries are filled in.
+        template: dict[str, Any] = {
+            "type": mat_name,
+            "base_color": colors,
+            "roughness": roughness,
+            "metallic": metallic,
         }
+        template.update(base_config)
+        mi_config = {}
+        for i, key in enumerate(_primitive_keys(n)):
+            bsdf_config = template.copy()
+            if color_list is not None:
+                bsdf_config["base_color"] = generate_color_config(color_list[i])
+            if roughness_list is not None:
+                bsdf_config["roughness"] = roughness_list[i]
+            if metallic_list is not None:
+                bsdf_config["metallic"] = metallic_list[i]
+            mi_config[key] = bsdf_config
     return mi_config
 
 
@@ -203,21 +253,28 @@ def generate_thin_dielectric_bsdf_config(mesh: lagrange.SurfaceMesh, mat: Dielec
 
 
 def generate_rough_dielectric_bsdf_config(
-    mesh: lagrange.SurfaceMesh, mat: RoughDielectric
+    mesh: lagrange.SurfaceMesh,
+    mat: RoughDielectric,
+    texture_configs: TextureConfigs | None = None,
 ):
     mi_config: dict[str, Any] = {
         "type": "roughdielectric",
         "int_ior": mat.int_ior,
         "ext_ior": mat.ext_ior,
         "distribution": mat.distribution,
-        "alpha": generate_float_color_texture_config(mesh, mat.alpha),
+        "alpha": generate_float_color_texture_config(
+            mesh, mat.alpha, texture_configs=texture_configs
+        ),
         "specular_reflectance": mat.specular_reflectance,
         "specular_transmittance": mat.specular_transmittance,
     }
     return mi_config
 
 
-def generate_hair_bsdf_config(mesh: lagrange.SurfaceMesh, mat: Hair):
+def generate_hair_bsdf_config(
+    mesh: lagrange.SurfaceMesh, mat: Hair, is_primitive: bool = False
+):
+    assert not is_primitive
     mi_config: dict[str, Any] = {
         "type": "hair",
         "eumelanin": mat.eumelanin,
@@ -235,16 +292,33 @@ def make_material_two_sided(mi_config: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def _get_constant_color(tex: TextureLike) -> Color | None:
+    """Get the color of a texture if it is constant everywhere, otherwise return None."""
+    match tex:
+        case Uniform():
+            return to_color(tex.color)
+        case Texture():
+            return None
+        case _:
+            return to_color(tex)
+
+
 def add_bump_map(
     mi_config: dict[str, Any],
     mesh: lagrange.SurfaceMesh,
     bump_map: BumpMap,
     is_primitive: bool,
+    texture_configs: TextureConfigs | None = None,
 ) -> dict[str, Any]:
     assert "type" in mi_config, "Bump map can only be applied over a single BSDF"
+    if bump_map.scale == 0 or _get_constant_color(bump_map.texture) is not None:
+        # A constant height field does not perturb the shading normal.
+        return mi_config
     return {
         "type": "bumpmap",
-        "bump_texture": generate_float_color_texture_config(mesh, bump_map.texture),
+        "bump_texture": generate_float_color_texture_config(
+            mesh, bump_map.texture, texture_configs=texture_configs
+        ),
         "scale": bump_map.scale,
         "bsdf": mi_config,
     }
@@ -254,77 +328,83 @@ def add_normal_map(
     mesh: lagrange.SurfaceMesh,
     normal_map: NormalMap,
     is_primitive: bool,
+    texture_configs: TextureConfigs | None = None,
 ) -> dict[str, Any]:
     assert "type" in mi_config, "Normal map can only be applied over a single BSDF"
+    color = _get_constant_color(normal_map.texture)
+    if color is not None and np.allclose(color.data, [0.5, 0.5, 1.0], atol=1e-3):
+        # The normal map encodes the unperturbed tangent space normal everywhere.
+        return mi_config
     return {
         "type": "normalmap",
-        "normalmap": generate_float_color_texture_config(mesh, normal_map.texture),
+        "normalmap": generate_float_color_texture_config(
+            mesh, normal_map.texture, texture_configs=texture_configs
+        ),
         "bsdf": mi_config,
     }
 
 
+# Map from material type to its bsdf config generator. Every generator takes `(mesh, mat,
+# is_primitive, texture_configs)` as arguments.
+_bsdf_generators: dict[type, Callable[..., dict[str, Any]]] = {
+    Diffuse: generate_diffuse_bsdf_config,
+    RoughConductor: lambda mesh, mat, _, texture_configs: (
+        generate_rough_conductor_bsdf_config(mesh, mat, texture_configs)
+    ),
+    Conductor: lambda mesh, mat, *_: generate_conductor_bsdf_config(mesh, mat),
+    RoughPlastic: lambda mesh, mat, _, texture_configs: (
+        generate_rough_plastic_bsdf_config(mesh, mat, texture_configs)
+    ),
+    Plastic: lambda mesh, mat, _, texture_configs: (
+        generate_plastic_bsdf_config(mesh, mat, texture_configs)
+    ),
+    Principled: generate_principled_bsdf_config,
+    ThinPrincipled: partial(generate_principled_bsdf_config, thin=True),
+    RoughDielectric: lambda mesh, mat, _, texture_configs: (
+        generate_rough_dielectric_bsdf_config(mesh, mat, texture_configs)
+    ),
+    ThinDielectric: lambda mesh, mat, *_: (
+        generate_thin_dielectric_bsdf_config(mesh, mat)
+    ),
+    Dielectric: lambda mesh, mat, *_: generate_dielectric_bsdf_config(mesh, mat),
+    Hair: lambda mesh, mat, is_primitive, _: (
+        generate_hair_bsdf_config(mesh, mat, is_primitive)
+    ),
+}
+
+
+def _get_bsdf_generator(material: Material) -> Callable[..., dict[str, Any]]:
+    # Walk the MRO so that user-defined subclasses fall back to their closest known base.
+    for cls in type(material).__mro__:
+        generator = _bsdf_generators.get(cls)
+        if generator is not None:
+            return generator
+    raise NotImplementedError(f"Unknown material type: {type(material)}")
+
+
 def generate_bsdf_config(view: View, is_primitive=False) -> dict[str, Any]:
     assert view.data_frame is not None
     assert view.material_channel is not None
     mesh = view.data_frame.mesh
-    material_config: dict[str, Any] = {}
-    match view.material_channel:
-        case Diffuse():
-            material_config = generate_diffuse_bsdf_config(
-                mesh, view.material_channel, is_primitive
-            )
-        case RoughConductor():
-            material_config = generate_rough_conductor_bsdf_config(
-                mesh, view.material_channel
-            )
-        case Conductor():
-            material_config = generate_conductor_bsdf_config(
-                mesh, view.material_channel
-            )
-        case RoughPlastic():
-            material_config = generate_rough_plastic_bsdf_config(
-                mesh, view.material_channel
-            )
-        case Plastic():
-            material_config = generate_plastic_bsdf_config(mesh, view.material_channel)
-        case Principled():
-            material_config = generate_principled_bsdf_config(
-                mesh, view.material_channel, is_primitive
-            )
-        case ThinPrincipled():
-            material_config = generate_principled_bsdf_config(
-                mesh, view.material_channel, is_primitive, thin=True
-            )
-        case RoughDielectric():
-            material_config = generate_rough_dielectric_bsdf_config(
-                mesh, view.material_channel
-            )
-        case ThinDielectric():
-            material_config = generate_thin_dielectric_bsdf_config(
-                mesh, view.material_channel
-            )
-        case Dielectric():
-            material_config = generate_dielectric_bsdf_config(
-                mesh, view.material_channel
-            )
-        case Hair():
-            assert not is_primitive
-            material_config = generate_hair_bsdf_config(mesh, view.material_channel)
-        case _:
-            raise NotImplementedError(
-                f"Unknown material type: {type(view.material_channel)}"
-            )
+    generator = _get_bsdf_generator(view.material_channel)
+
+    # A texture may be referenced by several fields of the material as well as the bump/normal
+    # map. Its config only needs to be generated once per view.
+    texture_configs: TextureConfigs = {}
+    material_config = generator(
+        mesh, view.material_channel, is_primitive, texture_configs
+    )
     if view.material_channel.two_sided:
         material_config = make_material_two_sided(material_config)
 
     if view.bump_map is not None:
         material_config = add_bump_map(
-            material_config, mesh, view.bump_map, is_primitive
+            material_config, mesh, view.bump_map, is_primitive, texture_configs
         )
 
     if view.normal_map is not None:
         material_config = add_normal_map(
-            material_config, mesh, view.normal_map, is_primitive
+            material_config, mesh, view.normal_map, is_primitive, texture_configs
         )
 
     return material_config
@@ -3,5 +3,10 @@ from ..common.to_color import to_color
 
 
 def generate_color_config(value: ColorLike):
+    match value:
+        case [float(), float(), float()]:
+            # Fast path for plain RGB values, e.g. per-primitive colors, which is equivalent to
+            # going through `to_color`.
+            return {"type": "rgb", "value": list(map(float, value))}
     c = to_color(value)
     return {"type": "rgb", "value": c.data.tolist()}
@@ -1,9 +1,8 @@
 from ..setup.emitter import Emitter, Point, Envmap
 from .spectrum import generate_spectrum_config
-from .utils import rotation
+from .utils import rotation, rotation_y
 
 from typing import Any
-import numpy.typing as npt
 import numpy as np
 import mitsuba as mi
 
@@ -16,18 +15,21 @@ def generate_emitter_config(emitter: Emitter) -> dict:
     match emitter:
         case Point():
             mi_config["type"] = "point"
-            mi_config["position"] = list(emitter.position)
+            position = emitter.position
+            if not isinstance(position, (list, tuple)):
+                # E.g. numpy arrays.
+                position = np.asarray(position, dtype=np.float64).tolist()
+            mi_config["position"] = position
             mi_config["intensity"] = generate_spectrum_config(emitter.intensity)
         case Envmap():
             mi_config["type"] = "envmap"
             mi_config["filename"] = str(emitter.filename)
             mi_config["scale"] = emitter.scale
-            mi_config["to_world"] = mi.ScalarTransform4f(  # type: ignore
-                rotation(np.array([0, 1, 0]), np.array(emitter.up))
-            ) @ mi.ScalarTransform4f().rotate(  # type: ignore
-                [0, 1, 0],
-                emitter.rotation,
+            # Compose the rotations in NumPy so that only a single Mitsuba transform is created.
+            to_world = rotation(np.array([0, 1, 0]), np.array(emitter.up)) @ rotation_y(
+                emitter.rotation
             )
+            mi_config["to_world"] = mi.ScalarTransform4f(to_world)  # type: ignore
         case _:
             raise NotImplementedError(f"Unknown emitter type: {type(emitter)}")
 
@@ -3,7 +3,7 @@ from ..compiler import View
 from ..grammar.channel.material import Dielectric
 
 from typing import Any
-from numpy.linalg import norm
+import math
 
 
 def generate_medium_config(view: View) -> dict[str, Any]:
@@ -21,7 +21,8 @@ def generate_medium_config(view: View) -> dict[str, Any]:
             raise NotImplementedError(f"Unsupported albedo type: {type(albedo)}")
 
     assert view.bbox is not None
-    bbox_diag = scale * norm(view.bbox[0] - view.bbox[1])
+    d = view.bbox[1] - view.bbox[0]
+    bbox_diag = scale * math.sqrt(d @ d)
     return {
         "type": "homogeneous",
         "albedo": albedo,
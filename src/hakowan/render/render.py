@@ -2,7 +2,7 @@ from .emitter import generate_emitter_config
 from .film import generate_film_config
 from .integrator import generate_integrator_config
 from .sampler import generate_sampler_config
-from .sensor import generate_sensor_config
+from .sensor import generate_sensor_config, generate_sensor_transform
 from .shape import generate_point_config, generate_curve_config, generate_surface_config
 
 from ..common import logger
@@ -11,17 +11,113 @@ from ..setup import Config
 from ..grammar import mark
 from ..grammar import layer
 
-import datetime
+from dataclasses import dataclass, fields
 import mitsuba as mi
 from typing import Any
 from pathlib import Path
 
 
-def generate_base_config(config: Config):
-    """Generate a Mitsuba base config dict from a Config."""
+# Total number of samples (width * height * sample_count) above which the GPU variant is preferred
+# when `Config.variant_policy` is "auto". Below it, kernel launch and JIT compilation overheads of
+# the GPU variant outweigh its throughput advantage.
+GPU_SAMPLE_BUDGET = 5e6
+
+# Config fields that only affect the camera. Changing them does not require reloading the scene.
+_CAMERA_FIELDS = ("sensor", "film", "sampler")
+
+# Sensor fields that only affect the camera pose. Changing them only updates the camera transform.
+_POSE_FIELDS = ("location", "target", "up")
+
+
+@dataclass(slots=True)
+class _CachedScene:
+    """A loaded Mitsuba scene along with the keys of the config it was generated from.
+
+    Attributes:
+        scene_key: Key of the layer tree and of all non-camera config fields.
+        camera_key: Key of the camera config fields, excluding the camera pose.
+        pose_key: Key of the camera pose.
+        scene: The loaded Mitsuba scene.
+        root: The root layer, kept alive so that the object ids in its signature remain valid.
+    """
+
+    scene_key: tuple
+    camera_key: tuple
+    pose_key: tuple
+    scene: Any
+    root: layer.Layer
+
+
+# The most recently loaded Mitsuba scene. Reusing the loaded scene across `render()` calls avoids
+# reloading the scene and rebuilding the JIT kernels.
+_cached_scene: _CachedScene | None = None
+
+
+def _ensure_variant():
+    """Activate a default Mitsuba variant if none has been selected yet."""
+    if mi.variant() is not None:
+        return
+
+    available_variants = set(mi.variants())
+    for variant in ("scalar_rgb", "cuda_ad_rgb", "llvm_ad_rgb"):
+        if variant not in available_variants:
+            continue
+        try:
+            mi.set_variant(variant)
+            break
+        except Exception:
+            logger.debug(f"Failed to activate Mitsuba variant '{variant}'.")
+    assert mi.variant() is not None
+
+
+def variant_candidates(config: Config) -> tuple[str, ...]:
+    """Mitsuba variants to try in order of preference according to `config.variant_policy`.
+
+    Raises:
+        ValueError: If the variant policy is unknown.
+    """
+    match config.variant_policy:
+        case "fixed":
+            return ()
+        case "auto":
+            budget = (
+                config.film.width * config.film.height * config.sampler.sample_count
+            )
+            if budget >= GPU_SAMPLE_BUDGET:
+                return ("cuda_ad_rgb", "llvm_ad_rgb", "scalar_rgb")
+            else:
+                return ("scalar_rgb", "llvm_ad_rgb")
+        case _:
+            raise ValueError(f"Unsupported variant policy: {config.variant_policy}")
+
+
+def select_variant(config: Config):
+    """Activate the Mitsuba variant according to `config.variant_policy`."""
+    available_variants = set(mi.variants())
+    for variant in variant_candidates(config):
+        if variant not in available_variants:
+            continue
+        if variant == mi.variant():
+            return
+        try:
+            mi.set_variant(variant)
+            return
+        except Exception:
+            logger.debug(f"Failed to activate Mitsuba variant '{variant}'.")
+
+
+def generate_camera_config(config: Config):
+    """Generate a Mitsuba sensor description dict, including film and sampler, from a Config."""
+    _ensure_variant()
     sensor_config = generate_sensor_config(config.sensor)
     sensor_config["film"] = generate_film_config(config.film)
     sensor_config["sampler"] = generate_sampler_config(config.sampler)
+    return sensor_config
+
+
+def generate_base_config(config: Config):
+    """Generate a Mitsuba base config dict from a Config."""
+    sensor_config = generate_camera_config(config)
     integrator_config = generate_integrator_config(config.integrator)
 
     mi_config = {
@@ -36,45 +132,59 @@ def generate_base_config(config: Config):
     return mi_config
 
 
-def generate_view_config(view: View, stamp: str, index: int):
+def generate_view_config(view: View, index: int):
     """Generate a Mitsuba shape description dict from a View."""
 
+    # The Mitsuba transform of the global transform is created once and shared by the shapes of
+    # the view.
+    to_world = mi.ScalarTransform4f(view.global_transform)  # type: ignore
+
     # Generate shape.
     match view.mark:
         case mark.Point:
-            mi_config = generate_point_config(view, stamp, index)
+            mi_config = generate_point_config(view, index, to_world)
         case mark.Curve:
-            mi_config = generate_curve_config(view, stamp, index)
+            mi_config = generate_curve_config(view, index, to_world)
         case mark.Surface:
-            mi_config = generate_surface_config(view, stamp, index)
+            mi_config = generate_surface_config(view, index, to_world)
 
     return mi_config
 
 
 def generate_scene_config(scene: Scene) -> dict:
     """Generate a mitsuba scene description dict from a Scene."""
-    stamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    scene_config: dict[str, Any] = {}
-    for i, view in enumerate(scene):
-        scene_config |= generate_view_config(view, stamp, i)
+    _ensure_variant()
+    # Merge all views in a single pass rather than growing the dict view by view.
+    scene_config: dict[str, Any] = {
+        key: value
+        for i, view in enumerate(scene)
+        for key, value in generate_view_config(view, i).items()
+    }
     return scene_config
 
 
 def dump_dict(data: dict, indent: int = 0):
-    lines = []
-    for key, value in data.items():
-        lines.append(" " * indent + f"{key}:")
-        if isinstance(value, dict):
-            lines.append(" " * indent + "{")
-            lines += dump_dict(value, indent + 4)
-            lines.append(" " * indent + "}")
-        else:
+    lines: list[str] = []
+    # Stack of (indent, item iterator) of the dicts being dumped.
+    stack = [(indent, iter(data.items()))]
+    while stack:
+        indent, items = stack[-1]
+        for key, value in items:
+            lines.append(" " * indent + f"{key}:")
+            if isinstance(value, dict):
+                lines.append(" " * indent + "{")
+                stack.append((indent + 4, iter(value.items())))
+                break
             sublines = value.__repr__().split("\n")
             if len(sublines) == 1:
                 lines[-1] += f" {sublines[0]}"
             else:
-                sublines = [" " * indent + line for line in sublines]
-                lines += sublines
+                lines.extend(" " * indent + line for line in sublines)
+        else:
+            # All items of the current dict are dumped.
+            stack.pop()
+            if stack:
+                lines.append(" " * stack[-1][0] + "}")
     return lines
 
 
@@ -83,23 +193,95 @@ def render(
     config: Config | None = None,
     filename: Path | str | None = None,
     xml_filename: Path | None = None,
+    reuse_scene: bool = False,
 ):
-    logger.info(f"Using Mitsuba variant '{mi.variant()}'.")
-    scene = compile(root)
-    logger.info("Compilation done")
+    """Render a layer tree.
+
+    Args:
+        root (Layer): The root layer of the layer tree to render.
+        config (Config, optional): The render configuration. Defaults to `Config()`.
+        filename (Path | str, optional): Output image filename.
+        xml_filename (Path, optional): Output filename for the Mitsuba scene description.
+        reuse_scene (bool, optional): Whether to reuse the Mitsuba scene loaded by the previous
+            call if neither the layer tree nor the config has changed since. Changes to the
+            sensor, film or sampler settings alone only reload the camera, and changes to the
+            camera pose alone (e.g. between animation frames) only update the camera transform.
+            This avoids reloading the scene and recompiling its kernels for repeated renders.
+            Changes made directly to the underlying data (e.g. editing mesh vertices in place)
+            are not detected.
+
+    Returns:
+        The rendered image.
+    """
+    global _cached_scene
 
     if config is None:
         config = Config()
 
-    mi_config = generate_base_config(config)
-    mi_config |= generate_scene_config(scene)
+    _ensure_variant()
+    select_variant(config)
+    logger.info(f"Using Mitsuba variant '{mi.variant()}'.")
+
+    scene_key = (
+        root.signature,
+        tuple(
+            repr(getattr(config, f.name))
+            for f in fields(config)
+            if f.name not in _CAMERA_FIELDS
+        ),
+        mi.variant(),
+    )
+    camera_key = (
+        type(config.sensor),
+        tuple(
+            repr(getattr(config.sensor, f.name))
+            for f in fields(config.sensor)
+            if f.name not in _POSE_FIELDS
+        ),
+        repr(config.film),
+        repr(config.sampler),
+    )
+    pose_key = tuple(repr(getattr(config.sensor, name)) for name in _POSE_FIELDS)
+
+    sensor: Any = 0
+    if (
+        reuse_scene
+        and xml_filename is None
+        and _cached_scene is not None
+        and _cached_scene.scene_key == scene_key
+    ):
+        logger.info("Reusing cached scene")
+        mi_scene = _cached_scene.scene
+        if _cached_scene.camera_key != camera_key:
+            sensor = mi.load_dict(generate_camera_config(config))
+        elif _cached_scene.pose_key != pose_key:
+            # Only the camera moved: update its transform in place.
+            params = mi.traverse(mi_scene)
+            params["camera.to_world"] = generate_sensor_transform(config.sensor)
+            params.update()
+            _cached_scene.pose_key = pose_key
+    else:
+        scene = compile(root)
+        logger.info("Compilation done")
+
+        mi_config = generate_base_config(config)
+        mi_config |= generate_scene_config(scene)
+
+        if xml_filename is not None:
+            mi.xml.dict_to_xml(mi_config, xml_filename)
+            logger.info(f"Scene saved to {xml_filename}")
 
-    if xml_filename is not None:
-        mi.xml.dict_to_xml(mi_config, xml_filename)
-        logger.info(f"Scene saved to {xml_filename}")
+        mi_scene = mi.load_dict(mi_config)
+        if reuse_scene:
+            _cached_scene = _CachedScene(
+                scene_key=scene_key,
+                camera_key=camera_key,
+                pose_key=pose_key,
+                scene=mi_scene,
+                root=root,
+            )
 
-    mi_scene = mi.load_dict(mi_config)
-    image = mi.render(scene=mi_scene)  # type: ignore
+    image = mi.render(scene=mi_scene, sensor=sensor)  # type: ignore
     logger.info("Rendering done")
 
     if config.albedo_only:
@@ -1,20 +1,27 @@
 from ..setup.sampler import Sampler, Independent, Stratified
 
-from typing import Any
+from typing import Any, Callable
+
+
+# Generators of the type-specific part of sampler configs.
+_sampler_generators: dict[type, Callable[[Any], dict[str, Any]]] = {
+    Independent: lambda sampler: {"type": "independent"},
+    Stratified: lambda sampler: {"type": "stratified", "jitter": sampler.jitter},
+}
+
+
+def _get_sampler_generator(sampler: Sampler) -> Callable[[Any], dict[str, Any]]:
+    # Walk the MRO so that user-defined subclasses fall back to their closest known base.
+    for cls in type(sampler).__mro__:
+        generator = _sampler_generators.get(cls)
+        if generator is not None:
+            return generator
+    raise NotImplementedError(f"Sampler {sampler} not implemented.")
 
 
 def generate_sampler_config(sampler: Sampler) -> dict:
-    mi_config: dict[str, Any] = {
+    generator = _get_sampler_generator(sampler)
+    return {
         "sample_count": sampler.sample_count,
         "seed": sampler.seed,
-    }
-    match sampler:
-        case Independent():
-            mi_config["type"] = "independent"
-        case Stratified():
-            mi_config["type"] = "stratified"
-            mi_config["jitter"] = sampler.jitter
-        case _:
-            raise NotImplementedError(f"Sampler {sampler} not implemented.")
-
-    return mi_config
+    } | generator(sampler)
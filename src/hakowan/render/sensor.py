@@ -1,34 +1,63 @@
 from ..setup.sensor import Sensor, Perspective, Orthographic, ThinLens
 
+from typing import Any, Callable
 import mitsuba as mi
 import numpy as np
 
 
+def _generate_perspective_config(sensor: Perspective) -> dict[str, Any]:
+    return {
+        "type": "perspective",
+        "fov": sensor.fov,
+        "fov_axis": sensor.fov_axis,
+    }
+
+
+def _generate_orthographic_config(sensor: Orthographic) -> dict[str, Any]:
+    return {"type": "orthographic"}
+
+
+def _generate_thinlens_config(sensor: ThinLens) -> dict[str, Any]:
+    return {
+        "type": "thinlens",
+        "fov": sensor.fov,
+        "fov_axis": sensor.fov_axis,
+        "aperture_radius": sensor.aperture_radius,
+        "focus_distance": sensor.focus_distance,
+    }
+
+
+# Generators of the type-specific part of sensor configs.
+_sensor_generators: dict[type, Callable[[Any], dict[str, Any]]] = {
+    Perspective: _generate_perspective_config,
+    Orthographic: _generate_orthographic_config,
+    ThinLens: _generate_thinlens_config,
+}
+
+
+def _get_sensor_generator(sensor: Sensor) -> Callable[[Any], dict[str, Any]]:
+    # Walk the MRO so that subclasses (e.g. ThinLens of Perspective) resolve to the closest match.
+    for cls in type(sensor).__mro__:
+        generator = _sensor_generators.get(cls)
+        if generator is not None:
+            return generator
+    raise NotImplementedError(f"Sensor {sensor} not implemented.")
+
+
+def generate_sensor_transform(sensor: Sensor):
+    """Generate the Mitsuba to_world transform of a Sensor."""
+    return mi.ScalarTransform4f().look_at(  # type: ignore
+        origin=sensor.location,
+        target=sensor.target,
+        up=sensor.up,
+    )
+
+
 def generate_sensor_config(sensor: Sensor) -> dict:
     """Generate a Mitsuba sensor description dict from a Sensor."""
-
-    mi_config = {
-        "to_world": mi.ScalarTransform4f().look_at(  # type: ignore
-            origin=sensor.location,
-            target=sensor.target,
-            up=sensor.up,
-        ),
+    generator = _get_sensor_generator(sensor)
+    return {
+        "to_world": generate_sensor_transform(sensor),
         "near_clip": sensor.near_clip,
         "far_clip": sensor.far_clip,
-    }
-
-    match sensor:
-        case Perspective():
-            mi_config["type"] = "perspective"
-            mi_config["fov"] = sensor.fov
-            mi_config["fov_axis"] = sensor.fov_axis
-        case Orthographic():
-            mi_config["type"] = "orthographic"
-        case ThinLens():
-            mi_config["type"] = "thinlens"
-            mi_config["aperture_radius"] = sensor.aperture_radius
-            mi_config["focus_distance"] = sensor.focus_distance
-        case _:
-            raise NotImplementedError(f"Sensor {sensor} not implemented.")
-
-    return mi_config
+    } | generator(sensor)
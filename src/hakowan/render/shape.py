@@ -8,8 +8,10 @@ from ..grammar.channel.curvestyle import Bend
 from ..grammar.channel.material import Dielectric
 from .utils import rotation
 
-from typing import Any
-import copy
+from typing import Any, Iterable
+import functools
+import hashlib
+import os
 import lagrange
 import mitsuba as mi
 import numpy as np
@@ -19,34 +21,140 @@ import re
 import tempfile
 
 
-def extract_size(view: View, default_size=0.01):
+@functools.cache
+def _temp_dir() -> pathlib.Path:
+    """The resolved temp directory where shape files are saved."""
+    return pathlib.Path(tempfile.gettempdir()).resolve()
+
+
+def _save_temp_file(content: bytes, suffix: str) -> pathlib.Path:
+    """Save content to a file in the temp directory named after the hash of the content.
+
+    If the file already exists, it has the same content and is reused as is. This avoids rewriting
+    unchanged meshes and curves across renders.
+
+    Args:
+        content: The file content.
+        suffix: The filename suffix.
+
+    Returns:
+        The resolved filename.
+    """
+    key = hashlib.blake2b(content, digest_size=16).hexdigest()
+    filename = _temp_dir() / f"hakowan-{key}{suffix}"
+    if not filename.exists():
+        # Write to a private file first so that a partially written file is never visible.
+        fd, tmp_name = tempfile.mkstemp(suffix=suffix, dir=filename.parent)
+        try:
+            with os.fdopen(fd, "wb") as fout:
+                fout.write(content)
+            os.replace(tmp_name, filename)
+        except BaseException:
+            os.remove(tmp_name)
+            raise
+    return filename
+
+
+def _stream_temp_file(chunks: Iterable[bytes], suffix: str) -> pathlib.Path:
+    """Stream content to a file in the temp directory named after the hash of the content.
+
+    Unlike `_save_temp_file`, the content is never held in memory as a whole. It is written to a
+    private file while being hashed, which is then moved to its final name.
+
+    Args:
+        chunks: The file content, chunk by chunk.
+        suffix: The filename suffix.
+
+    Returns:
+        The resolved filename.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    fd, tmp_name = tempfile.mkstemp(suffix=suffix, dir=_temp_dir())
+    try:
+        with os.fdopen(fd, "wb") as fout:
+            for chunk in chunks:
+                h.update(chunk)
+                fout.write(chunk)
+        filename = _temp_dir() / f"hakowan-{h.hexdigest()}{suffix}"
+        if not filename.exists():
+            os.replace(tmp_name, filename)
+            return filename
+    except BaseException:
+        os.remove(tmp_name)
+        raise
+    # A file with the same content already exists.
+    os.remove(tmp_name)
+    return filename
+
+
+def _save_mesh(
+    mesh: lagrange.SurfaceMesh, selected_attributes: list[int] | None = None
+) -> pathlib.Path:
+    """Save a mesh in binary ply format to a temp file named after its content."""
+    content = lagrange.io.mesh_to_string(  # type: ignore
+        mesh, "ply", binary=True, selected_attributes=selected_attributes
+    )
+    return _save_temp_file(content, ".ply")
+
+
+@functools.cache
+def _base_shape_content(base_shape: str) -> bytes:
+    """The binary ply content of a point mark base shape, serialized once per process."""
+    match base_shape:
+        case "sphere":
+            mesh = create_icosphere(1)
+        case "disk":
+            mesh = create_disk(16)
+        case _:
+            raise NotImplementedError(f"Unsupported base shape: {base_shape}")
+    return lagrange.io.mesh_to_string(mesh, "ply", binary=True)  # type: ignore
+
+
+def _save_base_shape(base_shape: str) -> pathlib.Path:
+    """Save a point mark base shape to a temp file, reusing the file if it already exists."""
+    return _save_temp_file(_base_shape_content(base_shape), ".ply")
+
+
+def extract_size(view: View, default_size=0.01, num_elements: int | None = None):
     """Extract the size attribute from a view.
 
     Args:
         view: The view to extract size from.
         default_size: The default size if size attribute is not specified.
+        num_elements: The number of size values to generate for uniform sizes. Defaults to the
+            number of vertices.
 
     Returns:
-        A list of size values of length n.
+        An array of size values of length n. Uniform sizes are returned as a read-only broadcast
+        view of a single value.
     """
     assert view.data_frame is not None
     mesh = view.data_frame.mesh
+    if num_elements is None:
+        num_elements = mesh.num_vertices
 
     if view.size_channel is not None:
         match view.size_channel.data:
             case float():
-                return view.size_channel.data
+                return np.broadcast_to(
+                    np.float64(view.size_channel.data), (num_elements,)
+                )
             case Attribute():
                 assert view.size_channel.data._internal_name is not None
-                return mesh.attribute(
-                    view.size_channel.data._internal_name
-                ).data.tolist()
+                return np.asarray(
+                    mesh.attribute(view.size_channel.data._internal_name).data,
+                    dtype=np.float64,
+                )
             case _:
                 raise NotImplementedError(
                     f"Unsupported size channel type: {type(view.size_channel.data)}"
                 )
     else:
-        return default_size
+        return np.broadcast_to(np.float64(default_size), (num_elements,))
+
+
+# Index of each entry of a 3x3 symmetric matrix in its packed form (a00, a11, a22, a10, a20, a21).
+_PACKED_SYMMETRIC_INDEX = np.array([[0, 3, 4], [3, 1, 5], [4, 5, 2]])
 
 
 def extract_transform_from_covariances(view: View):
@@ -69,23 +177,29 @@ def extract_transform_from_covariances(view: View):
 
     attr = mesh.attribute(attr_name)
     assert attr.element_type == lagrange.AttributeElement.Vertex
-    assert attr.data.shape[1] == 9
     if view.covariance_channel.full:
-        sigma = attr.data.reshape(-1, 3, 3)
+        data = attr.data
+        if data.shape[1] == 6:
+            # Symmetric matrices packed as (a00, a11, a22, a10, a20, a21).
+            sigma = data[:, _PACKED_SYMMETRIC_INDEX]
+        else:
+            assert data.shape[1] == 9
+            sigma = data.reshape(-1, 3, 3)
         U, S, Vh = np.linalg.svd(sigma)
-        S_diag = np.apply_along_axis(lambda _s: np.diag(_s), 1, S)
-        return U @ np.sqrt(S_diag)
+        # U @ diag(sqrt(S)), computed by scaling the columns of U.
+        return U * np.sqrt(S)[:, None, :]
     else:
+        assert attr.data.shape[1] == 9
         return attr.data.reshape(-1, 3, 3)
 
 
-def generate_point_config(view: View, stamp: str, index: int):
+def generate_point_config(view: View, index: int, to_world: Any):
     """Generate point cloud shapes from a View.
 
     Args:
         view: The view to generate point cloud shapes from.
-        stamp: The time stamp string used for creating a unique filename.
         index: The index of the view.
+        to_world: The Mitsuba transform of the view's global transform.
 
     Returns:
         The mitsuba config for the point cloud shapes.
@@ -95,6 +209,15 @@ def generate_point_config(view: View, stamp: str, index: int):
     shapes: list[dict[str, Any]] = []
     shape_group: dict[str, Any] = {}
 
+    # Generate bsdf, as a (key, config) entry per point.
+    bsdfs = generate_bsdf_config(view, is_primitive=True)
+    if "type" in bsdfs:
+        # Single bsdf
+        bsdf_items = [("bsdf", bsdfs)] * mesh.num_vertices
+    else:
+        bsdf_items = list(bsdfs.items())
+        assert len(bsdf_items) == mesh.num_vertices
+
     # Extract shape
     base_shape = "sphere"
     if view.shape_channel is not None:
@@ -103,38 +226,30 @@ def generate_point_config(view: View, stamp: str, index: int):
     if view.covariance_channel is None:
         # Compute radii
         radii = extract_size(view)
-        if np.isscalar(radii):
-            radii = [radii] * mesh.num_vertices
         assert len(radii) == mesh.num_vertices
 
-        # Generate spheres.
-        global_transform = mi.ScalarTransform4f(view.global_transform)  # type: ignore
         match base_shape:
             case "sphere":
                 # Ignore normal as sphere is invariant under rotation.
-                shapes = list(
-                    map(
-                        lambda itr: {
-                            "type": "sphere",
-                            "center": itr[1].tolist(),
-                            "radius": radii[itr[0]],
-                            "to_world": global_transform,
-                        },
-                        enumerate(mesh.vertices),
-                    )
-                )
-            case "cube" | "disk":
-                local_transforms = [
-                    np.array(
-                        [
-                            [radii[i], 0, 0, mesh.vertices[i][0]],
-                            [0, radii[i], 0, mesh.vertices[i][1]],
-                            [0, 0, radii[i], mesh.vertices[i][2]],
-                            [0, 0, 0, 1],
-                        ]
+                shapes = [
+                    {
+                        "type": "sphere",
+                        "center": center,
+                        "radius": radius,
+                        "to_world": to_world,
+                        bsdf_id: bsdf,
+                    }
+                    for center, radius, (bsdf_id, bsdf) in zip(
+                        mesh.vertices.tolist(), radii.tolist(), bsdf_items
                     )
-                    for i in range(mesh.num_vertices)
                 ]
+            case "cube" | "disk":
+                # Local transforms scale by the radius and translate to the vertex, shape (n, 4, 4).
+                local_transforms = np.zeros((mesh.num_vertices, 4, 4))
+                diag = np.arange(3)
+                local_transforms[:, diag, diag] = radii[:, None]
+                local_transforms[:, :3, 3] = mesh.vertices
+                local_transforms[:, 3, 3] = 1
 
                 # Apply normal rotation if necessary
                 if (
@@ -146,51 +261,46 @@ def generate_point_config(view: View, stamp: str, index: int):
                     assert normal_attr_name is not None
                     assert mesh.has_attribute(normal_attr_name)
 
-                    z = np.array([0, 0, 1])
+                    z = np.array([0.0, 0.0, 1.0])
                     normals = mesh.attribute(normal_attr_name).data  # type: ignore
 
-                    for i, m in enumerate(local_transforms):
-                        m[:, :] = m @ rotation(z, normals[i])
+                    # Only the rotations are computed per point; they are applied in one batched
+                    # matmul.
+                    rotations = np.stack([rotation(z, n) for n in normals])
+                    local_transforms = local_transforms @ rotations
 
                 if base_shape == "cube":
-                    # Generate cubes.
-                    shapes = list(
-                        map(
-                            lambda itr: {
-                                "type": "cube",
-                                "to_world": global_transform @ local_transforms[itr[0]],
-                            },
-                            enumerate(mesh.vertices),
-                        )
-                    )
-                elif base_shape == "disk":
-                    disk = create_disk(16)
-                    tmp_dir = pathlib.Path(tempfile.gettempdir())
-                    filename = tmp_dir / f"{stamp}-view-{index:03}.ply"
-                    logger.debug(f"Saving point mark shape to '{str(filename)}'.")
-                    lagrange.io.save_mesh(filename, disk)  # type: ignore
+                    base_shape_config: dict[str, Any] = {"type": "cube"}
+                else:
+                    filename = _save_base_shape("disk")
+                    logger.debug(f"Saved point mark shape to '{str(filename)}'.")
                     base_shape_config = {
                         "type": "ply",
-                        "filename": str(filename.resolve()),
+                        "filename": str(filename),
                         "face_normals": True,
                     }
-                    shapes = [
-                        base_shape_config | {"to_world": global_transform @ m}
-                        for m in local_transforms
-                    ]
+
+                # Compose with the global transform in numpy, so that a single Mitsuba transform
+                # is constructed per shape.
+                world_transforms = view.global_transform @ local_transforms
+                shapes = [
+                    base_shape_config
+                    | {
+                        "to_world": mi.ScalarTransform4f(m),  # type: ignore
+                        bsdf_id: bsdf,
+                    }
+                    for m, (bsdf_id, bsdf) in zip(world_transforms, bsdf_items)
+                ]
     else:  # with covariance
         # Generate base shape config.
         match base_shape:
             case "sphere":
                 # Generate point mark shape.
-                sphere = create_icosphere(1)
-                tmp_dir = pathlib.Path(tempfile.gettempdir())
-                filename = tmp_dir / f"{stamp}-view-{index:03}.ply"
-                logger.debug(f"Saving point mark shape to '{str(filename)}'.")
-                lagrange.io.save_mesh(filename, sphere)  # type: ignore
+                filename = _save_base_shape("sphere")
+                logger.debug(f"Saved point mark shape to '{str(filename)}'.")
                 base_shape_config = {
                     "type": "ply",
-                    "filename": str(filename.resolve()),
+                    "filename": str(filename),
                     "face_normals": False,
                 }
             case "cube":
@@ -198,32 +308,24 @@ def generate_point_config(view: View, stamp: str, index: int):
 
         # Compute radii, with default radii as 1.
         radii = extract_size(view, 1)
-        if np.isscalar(radii):
-            radii = [radii] * mesh.num_vertices
         assert len(radii) == mesh.num_vertices
 
+        # Build all local transforms at once and compose them with the global transform, shape
+        # (n, 4, 4).
         M = extract_transform_from_covariances(view)
-        global_transform = mi.ScalarTransform4f(view.global_transform)  # type: ignore
-        for i, v in enumerate(mesh.vertices):
-            local_transform = np.eye(4)
-            local_transform[:3, :3] = M[i] * radii[i]
-            local_transform[:3, 3] = v
-            local_transform = mi.ScalarTransform4f(local_transform)  # type: ignore
-            shape = base_shape_config.copy()
-            shape["to_world"] = global_transform @ local_transform
-            shapes.append(shape)
-
-    # Generate bsdf
-    bsdfs = generate_bsdf_config(view, is_primitive=True)
-    if "type" in bsdfs:
-        # Single bsdf
-        bsdf = bsdfs
-        for shape in shapes:
-            shape["bsdf"] = bsdf
-    else:
-        assert len(bsdfs) == len(shapes)
-        for (bsdf_id, bsdf), shape in zip(bsdfs.items(), shapes):
-            shape[bsdf_id] = bsdf
+        local_transforms = np.zeros((mesh.num_vertices, 4, 4))
+        local_transforms[:, :3, :3] = M * radii[:, None, None]
+        local_transforms[:, :3, 3] = mesh.vertices
+        local_transforms[:, 3, 3] = 1
+        world_transforms = view.global_transform @ local_transforms
+        shapes = [
+            base_shape_config
+            | {
+                "to_world": mi.ScalarTransform4f(m),  # type: ignore
+                bsdf_id: bsdf,
+            }
+            for m, (bsdf_id, bsdf) in zip(world_transforms, bsdf_items)
+        ]
 
     mi_config: dict[str, Any] = {
         f"view_{index:03}_shape_{i:06}": shape for i, shape in enumerate(shapes)
@@ -231,6 +333,32 @@ def generate_point_config(view: View, stamp: str, index: int):
     return mi_config
 
 
+# Coefficients of (control point 1, control point 2, tip) of a bent vector as linear combinations of
+# (base, tip, bend direction), per bend type.
+_BEND_COEFFICIENTS = {
+    "n": np.array([[1, 0, 1], [0, 1, 1], [0, 1, 0]], dtype=np.float64),
+    "r": np.array([[1, 0, 1], [0.5, 0.5, 1], [0, 1, 1]], dtype=np.float64),
+    "s": np.array([[1, 0, 1], [0, 1, 0], [0, 1, 1]], dtype=np.float64),
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _barycentric_weights(level: int) -> npt.NDArray:
+    """The (S, 3) barycentric coordinates of the samples of a facet at a refinement level.
+
+    Samples lie on a regular grid with `level + 1` subdivisions per edge. The returned array is
+    read-only since it is shared across calls.
+    """
+    n = level + 1
+    weights = np.array(
+        [(b0, b1, n - b0 - b1) for b0 in range(n + 1) for b1 in range(n + 1 - b0)],
+        dtype=np.float64,
+    )
+    weights /= n
+    weights.setflags(write=False)
+    return weights
+
+
 def extract_vector_field(view: View):
     assert view.data_frame is not None
     mesh = view.data_frame.mesh
@@ -242,23 +370,23 @@ def extract_vector_field(view: View):
     assert mesh.has_attribute(attr_name)
 
     attr = mesh.attribute(attr_name)
+    # Bind the attribute data once as contiguous float64 arrays. Every later access to `.data`
+    # would otherwise re-wrap the underlying buffer.
     match attr.element_type:
         case lagrange.AttributeElement.Vertex:
-            base = mesh.vertices
+            base = np.ascontiguousarray(mesh.vertices, dtype=np.float64)
             size = extract_size(view)
-            if np.isscalar(size):
-                size = [size] * mesh.num_vertices
         case lagrange.AttributeElement.Facet:
             centroid_attr_id = lagrange.compute_facet_centroid(mesh)
-            base = mesh.attribute(centroid_attr_id).data  # type: ignore
-            size = extract_size(view)
-            if np.isscalar(size):
-                size = [size] * mesh.num_facets
+            base = np.ascontiguousarray(
+                mesh.attribute(centroid_attr_id).data, dtype=np.float64  # type: ignore
+            )
+            size = extract_size(view, num_elements=mesh.num_facets)
         case _:
             raise NotImplementedError(
                 f"Unsupported vector field element type: {attr.element_type}"
             )
-    tip = attr.data + base
+    tip = np.ascontiguousarray(attr.data, dtype=np.float64) + base
     ctrl_pts_1: npt.NDArray | None = None
     ctrl_pts_2: npt.NDArray | None = None
 
@@ -276,54 +404,43 @@ def extract_vector_field(view: View):
             assert np.all(dirs.shape == base.shape)
 
             bend_type = view.vector_field_channel.style.bend_type
-            if bend_type == "n":
-                ctrl_pts_1 = base + dirs
-                ctrl_pts_2 = tip + dirs
-            elif bend_type == "r":
-                ctrl_pts_1 = base + dirs
-                ctrl_pts_2 = base + dirs + 0.5 * (tip - base)
-                tip = tip + dirs
-            elif bend_type == "s":
-                ctrl_pts_1 = base + dirs
-                ctrl_pts_2 = tip
-                tip = tip + dirs
-            else:
+            if bend_type not in _BEND_COEFFICIENTS:
                 raise NotImplementedError(f"Unsupported bend type: {bend_type}")
+            # All control points are linear combinations of base, tip and dirs, computed with a
+            # single matrix product.
+            points = np.stack([base, tip, dirs]).reshape(3, -1)
+            combined = _BEND_COEFFICIENTS[bend_type] @ points
+            ctrl_pts_1, ctrl_pts_2, tip = combined.reshape(3, *base.shape)
+
+    def refine(mesh: lagrange.SurfaceMesh, data: list[npt.NDArray], level: int):
+        """Refine per-facet data by sampling each facet on a regular barycentric grid.
 
-    def refine(mesh: lagrange.SurfaceMesh, data: npt.NDArray, level: int):
+        All arrays in `data` are refined together with a single matrix product.
+        """
         assert mesh.is_triangle_mesh, "Only triangle mesh is supported."
-        facets = mesh.facets
-        n = level + 1
-        refined_data = []
-        B0, B1, B2 = np.mgrid[0 : n + 1, 0 : n + 1, 0 : n + 1]
-        for b0, b1, b2 in zip(B0.ravel(), B1.ravel(), B2.ravel()):
-            s = b0 + b1 + b2
-            if s != n:
-                continue
-
-            d = (
-                data[facets[:, 0]] * b0
-                + data[facets[:, 1]] * b1
-                + data[facets[:, 2]] * b2
-            )
-            d /= n
-            refined_data.append(d)
-        return np.vstack(refined_data)
+        weights = _barycentric_weights(level)
+        widths = [1 if d.ndim == 1 else d.shape[1] for d in data]
+        stacked = np.hstack([d.reshape(len(d), -1) for d in data])
+        num_facets = mesh.num_facets
+        # Corner data of every facet, arranged as (3, F * D) so that all samples of all facets
+        # are computed by one BLAS matrix product of shape (S, 3) x (3, F * D).
+        corners = stacked[mesh.facets].transpose(1, 0, 2).reshape(3, -1)
+        refined = (weights @ corners).reshape(-1, stacked.shape[1])
+        return np.split(refined, np.cumsum(widths)[:-1], axis=1)
 
     if view.vector_field_channel.refinement_level > 0:
-        base = refine(mesh, base, view.vector_field_channel.refinement_level)
-        tip = refine(mesh, tip, view.vector_field_channel.refinement_level)
         if ctrl_pts_1 is not None:
             assert ctrl_pts_2 is not None
-            ctrl_pts_1 = refine(
-                mesh, ctrl_pts_1, view.vector_field_channel.refinement_level
+            base, tip, ctrl_pts_1, ctrl_pts_2, size = refine(
+                mesh,
+                [base, tip, ctrl_pts_1, ctrl_pts_2, size],
+                view.vector_field_channel.refinement_level,
             )
-            ctrl_pts_2 = refine(
-                mesh, ctrl_pts_2, view.vector_field_channel.refinement_level
+        else:
+            base, tip, size = refine(
+                mesh, [base, tip, size], view.vector_field_channel.refinement_level
             )
-        size = refine(
-            mesh, np.array(size), view.vector_field_channel.refinement_level
-        ).ravel()
+        size = size.ravel()
 
     base_size = size
     if view.vector_field_channel.end_type == "point":
@@ -331,12 +448,23 @@ def extract_vector_field(view: View):
     elif view.vector_field_channel.end_type == "arrow":
         assert ctrl_pts_1 is None
         assert ctrl_pts_2 is None
-        stem_point = 0.25 * base + 0.75 * tip
-        base = np.vstack([base, stem_point])
-        tip = np.vstack([stem_point, tip])
-        size = np.array(size)
-        base_size = np.hstack([size, 2 * size])
-        tip_size = np.hstack([size, np.zeros_like(size)])
+        # Each arrow is a stem followed by a head, both meeting at the stem point. The stem point
+        # is computed directly into the output arrays.
+        num_arrows = len(base)
+        arrow_base = np.empty((2 * num_arrows, 3), dtype=base.dtype)
+        arrow_tip = np.empty_like(arrow_base)
+        arrow_base[:num_arrows] = base
+        np.multiply(base, 0.25, out=arrow_base[num_arrows:])
+        arrow_base[num_arrows:] += 0.75 * tip
+        arrow_tip[:num_arrows] = arrow_base[num_arrows:]
+        arrow_tip[num_arrows:] = tip
+        base, tip = arrow_base, arrow_tip
+
+        base_size = np.empty(2 * num_arrows, dtype=size.dtype)
+        base_size[:num_arrows] = size
+        np.multiply(size, 2, out=base_size[num_arrows:])
+        tip_size = np.zeros_like(base_size)
+        tip_size[:num_arrows] = size
     else:
         tip_size = size
 
@@ -348,27 +476,57 @@ def extract_edges(view: View):
     mesh = view.data_frame.mesh
     mesh.initialize_edges()
 
-    base: npt.NDArray = np.ndarray((mesh.num_edges, mesh.dimension), dtype=np.float32)
-    tip: npt.NDArray = np.ndarray((mesh.num_edges, mesh.dimension), dtype=np.float32)
-    base_size: npt.NDArray = np.ndarray(mesh.num_edges, dtype=np.float32)
-    tip_size: npt.NDArray = np.ndarray(mesh.num_edges, dtype=np.float32)
-
-    sizes = extract_size(view)
-    if np.isscalar(sizes):
-        sizes = [sizes] * mesh.num_vertices
+    sizes = extract_size(view).astype(np.float32)
 
-    vertices = mesh.vertices
-    for i in range(mesh.num_edges):
-        edge_vts = mesh.get_edge_vertices(i)
-        base[i] = vertices[edge_vts[0]]
-        tip[i] = vertices[edge_vts[1]]
-        base_size[i] = sizes[edge_vts[0]]
-        tip_size[i] = sizes[edge_vts[1]]
+    # Convert the vertices once before gathering: there are about 3 times more edges than
+    # vertices, and the gather then works on float32 directly.
+    edges = mesh.edges
+    vertices = np.ascontiguousarray(mesh.vertices, dtype=np.float32)
+    base: npt.NDArray = vertices[edges[:, 0]]
+    tip: npt.NDArray = vertices[edges[:, 1]]
+    base_size: npt.NDArray = sizes[edges[:, 0]]
+    tip_size: npt.NDArray = sizes[edges[:, 1]]
 
     return [base, tip, base_size, tip_size]
 
 
-def generate_curve_config(view: View, stamp: str, index: int):
+def _save_curves(control_points: list[tuple[npt.NDArray, npt.NDArray]]) -> pathlib.Path:
+    """Save curves in Mitsuba's curve file format with a single write.
+
+    Args:
+        control_points: The (positions, radii) of each control point of the curves, where
+            positions is of shape (n, 3) and radii is of shape (n,) for n curves.
+
+    Returns:
+        The filename of the saved curves.
+    """
+    num_curves = len(control_points[0][0])
+    num_control_points = len(control_points)
+    data = np.empty((num_curves, num_control_points, 4), dtype=np.float64)
+    for i, (positions, radii) in enumerate(control_points):
+        data[:, i, :3] = positions
+        data[:, i, 3] = radii
+
+    # Each control point is a line of "x y z radius", and curves are separated by an empty line.
+    # Mitsuba only reads curves from text files, so the content is formatted as raw bytes to
+    # bypass the text layer. Formatting is done in batches of curves to bound memory usage while
+    # keeping the number of writes small. Coordinates are written with enough significant digits
+    # to round trip in the precision of the active variant: 9 for single and 17 for double.
+    digits = 17 if "double" in (mi.variant() or "") else 9
+    value_format = b"%%.%dg" % digits
+    curve_format = b" ".join([value_format] * 4) + b"\n"
+    curve_format = curve_format * num_control_points + b"\n"
+    batch_size = 4096
+
+    def format_batches():
+        for start in range(0, num_curves, batch_size):
+            batch = data[start : start + batch_size]
+            yield (curve_format * len(batch)) % tuple(batch.ravel().tolist())
+
+    return _stream_temp_file(format_batches(), ".txt")
+
+
+def generate_curve_config(view: View, index: int, to_world: Any):
     assert view.data_frame is not None
     mesh = view.data_frame.mesh
     shapes: list[dict[str, Any]] = []
@@ -391,61 +549,51 @@ def generate_curve_config(view: View, stamp: str, index: int):
         base, tip, base_size, tip_size = extract_edges(view)
         ctrl_pts_1 = ctrl_pts_2 = None
 
-    tmp_dir = pathlib.Path(tempfile.gettempdir())
-    filename = tmp_dir / f"{stamp}-view-{index:03}.txt"
-    logger.debug(f"Saving curves to '{str(filename)}'.")
-
     assert len(base) == len(tip)
     assert len(base) == len(base_size)
     assert len(tip) == len(tip_size)
-    with open(filename, "w") as fout:
-        if ctrl_pts_1 is None or ctrl_pts_2 is None:
-            curve_type = "linearcurve"
-            for p0, p1, s0, s1 in zip(base, tip, base_size, tip_size):
-                fout.write(f"{p0[0]} {p0[1]} {p0[2]} {s0 * scale_correction_factor}\n")
-                fout.write(
-                    f"{p1[0]} {p1[1]} {p1[2]} {s1 * scale_correction_factor}\n\n"
-                )
-        else:
-            curve_type = "bsplinecurve"
-            for p0, p1, p2, p3, s0, s3 in zip(
-                base, ctrl_pts_1, ctrl_pts_2, tip, base_size, tip_size
-            ):
-                s1 = 0.75 * s0 + 0.25 * s3
-                s2 = 0.25 * s0 + 0.75 * s3
-                fout.write(f"{p0[0]} {p0[1]} {p0[2]} {s0 * scale_correction_factor}\n")
-                fout.write(f"{p0[0]} {p0[1]} {p0[2]} {s0 * scale_correction_factor}\n")
-                fout.write(f"{p0[0]} {p0[1]} {p0[2]} {s0 * scale_correction_factor}\n")
-                fout.write(f"{p0[0]} {p0[1]} {p0[2]} {s0 * scale_correction_factor}\n")
-                fout.write(f"{p1[0]} {p1[1]} {p1[2]} {s1 * scale_correction_factor}\n")
-                fout.write(f"{p2[0]} {p2[1]} {p2[2]} {s2 * scale_correction_factor}\n")
-                fout.write(f"{p3[0]} {p3[1]} {p3[2]} {s3 * scale_correction_factor}\n")
-                fout.write(f"{p3[0]} {p3[1]} {p3[2]} {s3 * scale_correction_factor}\n")
-                fout.write(f"{p3[0]} {p3[1]} {p3[2]} {s3 * scale_correction_factor}\n")
-                fout.write(
-                    f"{p3[0]} {p3[1]} {p3[2]} {s3 * scale_correction_factor}\n\n"
-                )
+    base_size = base_size * scale_correction_factor
+    tip_size = tip_size * scale_correction_factor
+    if ctrl_pts_1 is None or ctrl_pts_2 is None:
+        curve_type = "linearcurve"
+        control_points = [(base, base_size), (tip, tip_size)]
+    else:
+        curve_type = "bsplinecurve"
+        s1 = 0.75 * base_size + 0.25 * tip_size
+        s2 = 0.25 * base_size + 0.75 * tip_size
+        control_points = (
+            [(base, base_size)] * 4
+            + [(ctrl_pts_1, s1), (ctrl_pts_2, s2)]
+            + [(tip, tip_size)] * 4
+        )
+    filename = _save_curves(control_points)
+    logger.debug(f"Saved curves to '{str(filename)}'.")
 
     mi_config = {
         f"view_{index:03}_shape_000000": {
             "type": curve_type,
-            "filename": str(filename.resolve()),
+            "filename": str(filename),
             "bsdf": generate_bsdf_config(view, is_primitive=False),
-            "to_world": mi.ScalarTransform4f(view.global_transform),  # type: ignore
+            "to_world": to_world,
         }
     }
     return mi_config
 
 
-def _rename_attributes(mesh: lagrange.SurfaceMesh, active_attributes: list[Attribute]):
+def _rename_attributes(
+    mesh: lagrange.SurfaceMesh, active_attributes: list[Attribute]
+) -> list[tuple[str, str]]:
     """Rename generic scalar and vector attribute with suffix "_0". This is required by mitsuba to
     correct parse them from a ply file.
 
     Args:
         mesh: The mesh to rename attributes.
         active_attributes: The list of active attributes.
+
+    Returns:
+        The list of (old name, new name) of the renamed attributes.
     """
-    processed_names = set()
+    processed_names: dict[str, str] = {}
     for attr in active_attributes:
         name = attr._internal_name
         assert name is not None
@@ -466,13 +614,15 @@ def _rename_attributes(mesh: lagrange.SurfaceMesh, active_attributes: list[Attri
         # It seems mitsuba requires a "_#" suffix to work propertly with scalar/vector
         # attributes. Color/position/normal/uv attributes all has their own representation in ply
         # format, so they do not need to be changed.
-        mesh.rename_attribute(name, f"{name}_0")
-        processed_names.add(name)
+        mesh.rename_attribute(name, new_name)
+        processed_names[name] = new_name
 
         # Note that we will keep attr._internal_name the same.
 
+    return list(processed_names.items())
+
 
-def generate_surface_config(view: View, stamp: str, index: int):
+def generate_surface_config(view: View, index: int, to_world: Any):
     """Generate the mitsuba config for a mesh.
 
     It does the following things:
@@ -482,49 +632,48 @@ def generate_surface_config(view: View, stamp: str, index: int):
 
     Args:
         view: The view to generate mesh config from.
-        stamp: The time stamp string used for creating a unique filename.
         index: The index of the view.
+        to_world: The Mitsuba transform of the view's global transform.
 
     Returns:
         The mitsuba config for the mesh view.
     """
     assert view.data_frame is not None
-    mesh = copy.copy(view.data_frame.mesh)  # Shallow copy
+    mesh = view.data_frame.mesh
     if not mesh.is_triangle_mesh:
+        # The compiler gives each view its own copy of the data frame, so it is triangulated in
+        # place. The triangulated mesh is kept on the view and reused by later calls.
         logger.debug("Convert dataframe to triangle mesh.")
         lagrange.triangulate_polygonal_facets(mesh)
 
-    # Rename attributes in the shallow copy of mesh.
-    _rename_attributes(mesh, view._active_attributes)
-
-    # Just a sanity check that all attributes are still present in the original mesh.
-    for attr in view._active_attributes:
-        name = attr._internal_name
-        assert name is not None
-        assert view.data_frame.mesh.has_attribute(name)
-
-    # Mitsuba's ply plugin offer limited support normmal attributes.
+    # Mitsuba's ply plugin offer limited support normmal attributes, so they are not saved.
     normal_ids = mesh.get_matching_attribute_ids(usage=lagrange.AttributeUsage.Normal)
     if len(normal_ids) > 0:
         normal_attr = mesh.attribute(normal_ids[0])  # type: ignore
         use_facet_normal = normal_attr.element_type == lagrange.AttributeElement.Facet
-        for normal_id in normal_ids:
-            mesh.delete_attribute(normal_id)
     else:
         use_facet_normal = False
-
-    tmp_dir = pathlib.Path(tempfile.gettempdir())
-    filename = tmp_dir / f"{stamp}-view-{index:03}.ply"
-    logger.debug(f"Saving mesh to '{str(filename)}'.")
-    lagrange.io.save_mesh(filename, mesh)  # type: ignore
-
+    selected_attributes = [
+        attr_id
+        for attr_id in mesh.get_matching_attribute_ids()
+        if attr_id not in normal_ids
+    ]
+
+    # Rename attributes in place for saving, and restore their names afterwards.
+    renamed_attributes = _rename_attributes(mesh, view._active_attributes)
+    try:
+        filename = _save_mesh(mesh, selected_attributes)
+    finally:
+        for name, new_name in renamed_attributes:
+            mesh.rename_attribute(new_name, name)
+    logger.debug(f"Saved mesh to '{str(filename)}'.")
 
     mi_config = {
         "type": "ply",
-        "filename": str(filename.resolve()),
+        "filename": str(filename),
         "bsdf": generate_bsdf_config(view, is_primitive=False),
         "face_normals": use_facet_normal,
-        "to_world": mi.ScalarTransform4f(view.global_transform),  # type: ignore
+        "to_world": to_world,
     }
 
     # Generate medium setting for dielectric and its derived materials.
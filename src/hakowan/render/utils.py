@@ -3,18 +3,44 @@ import numpy.typing as npt
 
 
 def rotation(from_vector: npt.NDArray, to_vector: npt.NDArray):
+    """Compute the 4x4 rotation matrix that rotates unit vector `from_vector` to unit vector
+    `to_vector`.
+    """
     axis = np.cross(from_vector, to_vector)
     sin_a = np.linalg.norm(axis)
     cos_a = np.dot(from_vector, to_vector)
+    A = np.eye(4, dtype=np.float64)
     if sin_a < 1e-9:
-        return np.eye(4)
+        if cos_a < 0:
+            # Rotate by 180 degrees around an axis perpendicular to `from_vector`.
+            u = np.cross(from_vector, [1.0, 0.0, 0.0])
+            if np.dot(u, u) < 1e-6:
+                u = np.cross(from_vector, [0.0, 1.0, 0.0])
+            u = u / np.linalg.norm(u)
+            A[:3, :3] = 2 * np.outer(u, u) - np.eye(3)
+        return A
     else:
-        v = np.array(axis / sin_a, dtype=np.float64)
-        I = np.eye(3)
-        H = np.outer(v, v)
-        S = np.cross(I, v)
-        M = I * cos_a + S * sin_a + H * (1 - cos_a)
-
-        A = np.eye(4, dtype=np.float64)
-        A[:3, :3] = M
+        # Rodrigues' rotation formula with K being the cross product matrix of the unnormalized
+        # rotation axis.
+        K = np.array(
+            [
+                [0, -axis[2], axis[1]],
+                [axis[2], 0, -axis[0]],
+                [-axis[1], axis[0], 0],
+            ],
+            dtype=np.float64,
+        )
+        A[:3, :3] += K + K @ K * ((1 - cos_a) / (sin_a * sin_a))
         return A
+
+
+def rotation_y(angle: float):
+    """Compute the 4x4 rotation matrix that rotates around the y axis by `angle` degrees."""
+    theta = np.radians(angle)
+    c, s = np.cos(theta), np.sin(theta)
+    A = np.eye(4, dtype=np.float64)
+    A[0, 0] = c
+    A[0, 2] = s
+    A[2, 0] = -s
+    A[2, 2] = c
+    return A
@@ -7,6 +7,7 @@ from ..common import logger
 
 import numpy as np
 from dataclasses import dataclass, field
+from typing import Literal
 
 
 @dataclass(kw_only=True, slots=True)
@@ -20,12 +21,17 @@ class Config:
         emitters: Emitter settings.
         integrator: Integrator settings.
         albedo_only: Whether to render albedo only (i.e. without shading).
+        variant_policy: How the Mitsuba variant is chosen at render time. "fixed" keeps the
+            currently active variant. "auto" picks a CPU variant for small workloads and a GPU
+            variant (if available) for large workloads, where the workload is measured as the
+            total number of samples (i.e. width * height * sample_count).
     """
     sensor: Sensor = field(default_factory=Perspective)
     film: Film = field(default_factory=Film)
     sampler: Sampler = field(default_factory=Independent)
     emitters: list[Emitter] = field(default_factory=lambda: [Envmap()])
     integrator: Integrator = field(default_factory=Path)
+    variant_policy: Literal["fixed", "auto"] = "fixed"
     _albedo_only: bool = False
 
     def z_up(self):
@@ -45,3 +45,11 @@ class TestColorMap:
         assert np.allclose(cm(0.5000001).data, colors[2])
         assert np.allclose(cm(0.7500001).data, colors[3])
         assert np.allclose(cm(1).data, colors[4])
+
+    def test_evaluate(self):
+        colors = np.vstack([np.zeros(3), np.ones(3) * 0.2, np.ones(3)])
+        cm = ColorMap(colors)
+        values = np.array([-0.5, 0, 0.1, 0.5, 0.75, 1, 1.5])
+        expected = np.array([cm(v).data for v in values])
+        assert np.allclose(cm.evaluate(values), expected)
+        assert np.allclose(ColorMap(list(colors)).evaluate(values), expected)
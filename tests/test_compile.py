@@ -124,6 +124,7 @@ class TestCompile:
         assert color_attr.num_channels == 3
 
         colors = color_attr.data
+        assert colors.dtype == np.float32
         assert colors[0] == pytest.approx([0.267004, 0.004874, 0.329415])
         assert colors[2] == pytest.approx([0.993248, 0.906157, 0.143936])
         assert np.amax(np.absolute(colors[1] - colors[0])) > 0.1
@@ -155,6 +156,52 @@ class TestCompile:
         assert scene[0].data_frame.mesh.num_facets == 1
         assert scene[1].data_frame.mesh.num_facets == 2
 
+    def test_multiple_views_bbox(self, triangle, two_triangles):
+        combined = (hkw.layer(data=two_triangles) + hkw.layer(data=triangle)).mark(
+            hkw.mark.Surface
+        )
+        scene = hkw.compiler.compile(combined)
+
+        # Each view keeps its own bounding box after the global transform is computed.
+        for view, mesh in zip(scene, [two_triangles, triangle]):
+            assert np.allclose(view.bbox[0], np.amin(mesh.vertices, axis=0))
+            assert np.allclose(view.bbox[1], np.amax(mesh.vertices, axis=0))
+        assert np.allclose(scene[0].global_transform, scene[1].global_transform)
+
+    def test_nested_layers(self, triangle, two_triangles):
+        root = hkw.layer(
+            data=triangle, mark=hkw.mark.Point, channels=[hkw.channel.Size(0.1)]
+        )
+        l1 = hkw.layer(data=two_triangles).mark(hkw.mark.Surface).channel(size=0.2)
+        l2 = hkw.layer().translate([1, 0, 0]).channel(shape="cube")
+        root.children = [l1, l2]
+
+        scene = hkw.compiler.compile(root.translate([0, 1, 0]))
+        assert len(scene) == 2
+        for view in scene:
+            # Ancestors have precedence over descendants.
+            assert view.mark == hkw.mark.Point
+            assert view.data_frame.mesh.num_facets == 1
+            assert view.size_channel.data == 0.1
+        assert len(scene[0].channels) == 2
+        assert len(scene[1].channels) == 2
+        assert isinstance(scene[0].transform, hkw.transform.Affine)
+        assert scene[0].transform._child is None
+        assert isinstance(scene[1].transform._child, hkw.transform.Affine)
+
+    def test_deep_layer_tree(self, triangle):
+        leaf = hkw.layer(data=triangle, mark=hkw.mark.Surface)
+        root = leaf
+        # Deeper than the default recursion limit.
+        for _ in range(2000):
+            parent = hkw.layer()
+            parent.children = [root]
+            root = parent
+
+        scene = hkw.compiler.compile(root)
+        assert len(scene) == 1
+        assert scene[0].data_frame.mesh.num_facets == 1
+
     def test_vector_field(self, triangle):
         mesh = triangle
         attr_id = lagrange.compute_vertex_normal(mesh)
@@ -191,6 +238,46 @@ class TestCompile:
         assert np.all(bbox[0] == pytest.approx(bbox_min))
         assert np.all(bbox[1] == pytest.approx(bbox_max))
 
+    def test_transform_order(self, two_triangles):
+        applied = []
+
+        def recording_filter(name):
+            def condition(values):
+                applied.append(name)
+                return np.ones(len(values), dtype=bool)
+
+            return hkw.transform.Filter(
+                data=hkw.attribute(name="facet_index"),
+                condition=condition,
+                vectorized=True,
+            )
+
+        leaf = hkw.layer(two_triangles).transform(recording_filter("leaf"))
+        root = leaf.transform(recording_filter("root"))
+        hkw.compiler.compile(root)
+
+        # The transform of the layer closest to the leaf is applied first.
+        assert applied == ["leaf", "root"]
+
+    def test_vectorized_filter_transform(self, two_triangles):
+        base = (
+            hkw.layer()
+            .data(two_triangles)
+            .mark(hkw.mark.Point)
+            .transform(
+                hkw.transform.Filter(
+                    condition=lambda p: p[:, 0] > 0.5,
+                    vectorized=True,
+                )
+            )
+        )
+        scene = hkw.compiler.compile(base)
+
+        assert len(scene) == 1
+        vertices = scene[0].data_frame.mesh.vertices
+        assert len(vertices) == np.count_nonzero(two_triangles.vertices[:, 0] > 0.5)
+        assert np.all(vertices[:, 0] > 0.5)
+
     def test_uv_mesh_transform(self, triangle):
         mesh = triangle
         mesh.vertices[:, 2] = 1
@@ -312,6 +399,12 @@ class TestScale:
         sc = hkw.scale.Custom(function=lambda x: x**2)
         self.__apply_scale(df, "vertex_data", sc, np.array([1, 4, 9]))
 
+    def test_vectorized_custom(self, triangle):
+        mesh = triangle
+        df = hkw.dataframe.DataFrame(mesh=mesh)
+        sc = hkw.scale.Custom(function=np.square, vectorized=True)
+        self.__apply_scale(df, "vertex_data", sc, np.array([1, 4, 9]))
+
     def test_affine_scaling(self, triangle):
         mesh = triangle
         df = hkw.dataframe.DataFrame(mesh=mesh)
@@ -37,3 +37,20 @@ class TestLayer:
         assert isinstance(ch, hkw.channel.Normal)
         assert isinstance(ch.data, hkw.attribute)
         assert ch.data.name == mesh.get_attribute_name(attr_id)
+
+    def test_signature(self):
+        l0 = hkw.layer()
+        l1 = l0.mark(hkw.mark.Point)
+        signature = l1.signature
+        assert l1.signature == signature
+
+        l0.mark(hkw.mark.Surface, in_place=True)
+        assert l1.signature != signature
+
+    def test_equality_ignores_version(self):
+        # Layers created separately get different versions but still compare equal.
+        l0 = hkw.layer().mark(hkw.mark.Point)
+        l1 = hkw.layer().mark(hkw.mark.Point)
+        assert l0._version != l1._version
+        assert l0 == l1
+        assert "_version" not in repr(l0)
@@ -1,13 +1,62 @@
 import pytest
+import importlib
+import os
 import pathlib
 import hakowan as hkw
-from hakowan.render.render import generate_scene_config
+from hakowan.render.render import (
+    GPU_SAMPLE_BUDGET,
+    generate_scene_config,
+    select_variant,
+    variant_candidates,
+)
+from hakowan.render.shape import (
+    extract_vector_field,
+    extract_transform_from_covariances,
+    _save_curves,
+    _save_temp_file,
+    _stream_temp_file,
+)
+from hakowan.render.utils import rotation
+from hakowan.render.base_shapes import create_icosphere
 import lagrange
+import mitsuba as mi
 import numpy as np
 
 from .asset import triangle, two_triangles
 
 
+def small_config():
+    """A render config small enough for tests, lit by a point light."""
+    config = hkw.config()
+    config.film.width = 16
+    config.film.height = 16
+    config.sampler.sample_count = 4
+    config.emitters = [hkw.setup.emitter.Point(intensity=10.0, position=[0, 0, 5])]
+    return config
+
+
+@pytest.fixture
+def scene_builds(monkeypatch):
+    """Start from an empty render scene cache and record every scene compiled by `render()`."""
+    render_module = importlib.import_module("hakowan.render.render")
+    mi.set_variant("scalar_rgb")
+    monkeypatch.setattr(render_module, "_cached_scene", None)
+
+    builds = []
+    compile_scene = render_module.compile
+
+    def recording_compile(root):
+        builds.append(root)
+        return compile_scene(root)
+
+    monkeypatch.setattr(render_module, "compile", recording_compile)
+    return builds
+
+
+def render_image(root, config, reuse_scene=False):
+    return np.asarray(hkw.render(root, config=config, reuse_scene=reuse_scene))
+
+
 class TestRender:
     def test_render(self, triangle):
         mesh = triangle
@@ -20,6 +69,8 @@ class TestRender:
         for shape_id, shape in scene_config.items():
             assert shape["type"] == "ply"
             assert pathlib.Path(shape["filename"]).exists()
+            with open(shape["filename"], "rb") as fin:
+                assert b"format binary_little_endian" in fin.read(64)
 
     def test_point_cloud(self, triangle):
         mesh = triangle
@@ -65,3 +116,320 @@ class TestRender:
         )
         scene = hkw.compiler.compile(base)
         scene_config = generate_scene_config(scene)
+
+    def test_rotation(self):
+        a = np.array([0, 1, 0])
+        b = np.array([1, 1, 0]) / np.sqrt(2)
+        for from_vector, to_vector in [(a, b), (a, a), (a, -a), (b, -b)]:
+            M = rotation(from_vector, to_vector)
+            assert M.shape == (4, 4)
+            assert M[:3, :3] @ from_vector == pytest.approx(to_vector)
+            assert np.linalg.det(M[:3, :3]) == pytest.approx(1)
+
+    def test_icosphere(self):
+        for level, num_vertices, num_facets in [
+            (0, 12, 20),
+            (1, 42, 80),
+            (2, 162, 320),
+        ]:
+            sphere = create_icosphere(level)
+            assert sphere.num_vertices == num_vertices
+            assert sphere.num_facets == num_facets
+            assert np.linalg.norm(sphere.vertices, axis=1) == pytest.approx(1)
+            sphere.initialize_edges()
+            assert sphere.num_edges == num_vertices + num_facets - 2
+
+    def test_identity_bump_and_normal_map(self, triangle):
+        base = hkw.layer(triangle)
+        for channels in [
+            {"bump_map": hkw.channel.BumpMap(hkw.texture.Uniform(color=0.3))},
+            {"bump_map": hkw.channel.BumpMap(hkw.texture.Checkerboard(), scale=0)},
+            {"normal_map": hkw.texture.Uniform(color=(0.5, 0.5, 1))},
+        ]:
+            scene = hkw.compiler.compile(base.channel(**channels))
+            scene_config = generate_scene_config(scene)
+            for shape in scene_config.values():
+                assert shape["bsdf"]["type"] == "plastic"
+
+        scene = hkw.compiler.compile(base.channel(bump_map=hkw.texture.Checkerboard()))
+        scene_config = generate_scene_config(scene)
+        for shape in scene_config.values():
+            assert shape["bsdf"]["type"] == "bumpmap"
+
+    def test_shared_texture_config(self, triangle):
+        tex = hkw.texture.Checkerboard(
+            texture1=hkw.texture.Uniform(color=0.1),
+            texture2=hkw.texture.Uniform(color=0.4),
+        )
+        base = hkw.layer(triangle).channel(
+            material=hkw.material.RoughConductor(material="Cu", alpha=tex),
+            bump_map=hkw.channel.BumpMap(tex),
+        )
+        scene_config = generate_scene_config(hkw.compiler.compile(base))
+        for shape in scene_config.values():
+            assert shape["bsdf"]["type"] == "bumpmap"
+            # The texture config is generated once and shared within the view.
+            assert shape["bsdf"]["bump_texture"] is shape["bsdf"]["bsdf"]["alpha"]
+
+    def test_surface_attribute_names_restored(self, triangle):
+        mesh = triangle
+        mesh.create_attribute(
+            "s",
+            element=lagrange.AttributeElement.Vertex,
+            usage=lagrange.AttributeUsage.Scalar,
+            initial_values=np.array([1, 2, 3], dtype=np.float64),
+        )
+        base = hkw.layer(mesh).channel(
+            material=hkw.material.Principled(roughness=hkw.texture.ScalarField("s"))
+        )
+        scene = hkw.compiler.compile(base)
+        names = [
+            scene[0].data_frame.mesh.get_attribute_name(i)
+            for i in scene[0].data_frame.mesh.get_matching_attribute_ids()
+        ]
+        generate_scene_config(scene)
+        assert names == [
+            scene[0].data_frame.mesh.get_attribute_name(i)
+            for i in scene[0].data_frame.mesh.get_matching_attribute_ids()
+        ]
+
+    def test_point_cloud_base_shapes(self, triangle):
+        base = hkw.layer(triangle).mark(hkw.mark.Point)
+        for base_shape, shape_type in [("cube", "cube"), ("disk", "ply")]:
+            scene = hkw.compiler.compile(
+                base.channel(shape=hkw.channel.Shape(base_shape=base_shape))
+            )
+            scene_config = generate_scene_config(scene)
+            assert len(scene_config) == 3
+            for shape in scene_config.values():
+                assert shape["type"] == shape_type
+
+    def test_refined_vector_field(self, triangle):
+        triangle.create_attribute(
+            "vector",
+            element=lagrange.AttributeElement.Vertex,
+            usage=lagrange.AttributeUsage.Vector,
+            initial_values=np.eye(3),
+        )
+        base = hkw.layer(triangle).mark(hkw.mark.Curve)
+        vector_field = hkw.channel.VectorField(data="vector", refinement_level=1)
+        scene = hkw.compiler.compile(base.channel(vector_field=vector_field))
+        base, _, _, tip, base_size, tip_size = extract_vector_field(scene[0])
+        vertices = triangle.vertices
+        # 6 barycentric samples per facet at refinement level 1.
+        assert base.shape == (6, 3)
+        assert base_size.shape == (6,)
+        assert np.allclose(base[0], vertices[2])
+        assert np.allclose(base[1], (vertices[1] + vertices[2]) / 2)
+        assert np.allclose(tip[0] - base[0], [0, 0, 1])
+        assert np.allclose(tip[1] - base[1], [0, 0.5, 0.5])
+
+    def test_packed_covariance(self, triangle):
+        A = np.array([[2, 1, 0], [0, 1, 0], [1, 0, 3]], dtype=np.float64)
+        sigma = A @ A.T
+        triangle.create_attribute(
+            "full",
+            element=lagrange.AttributeElement.Vertex,
+            usage=lagrange.AttributeUsage.Vector,
+            initial_values=np.tile(sigma.ravel(), (3, 1)),
+        )
+        triangle.create_attribute(
+            "packed",
+            element=lagrange.AttributeElement.Vertex,
+            usage=lagrange.AttributeUsage.Vector,
+            initial_values=np.tile(
+                sigma[[0, 1, 2, 1, 2, 2], [0, 1, 2, 0, 0, 1]], (3, 1)
+            ),
+        )
+        base = hkw.layer(triangle).mark(hkw.mark.Point)
+        transforms = []
+        for name in ["full", "packed"]:
+            scene = hkw.compiler.compile(
+                base.channel(covariance=hkw.channel.Covariance(data=name, full=True))
+            )
+            M = extract_transform_from_covariances(scene[0])
+            assert np.allclose(M @ M.transpose(0, 2, 1), sigma)
+            transforms.append(M)
+        assert np.allclose(transforms[0], transforms[1])
+
+    def test_quad_surface(self):
+        mesh = lagrange.SurfaceMesh()
+        mesh.add_vertices(
+            np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=float)
+        )
+        mesh.add_quad(0, 1, 2, 3)
+        scene = hkw.compiler.compile(hkw.layer(mesh).mark(hkw.mark.Surface))
+        scene_config = generate_scene_config(scene)
+        assert len(scene_config) == 1
+        assert scene[0].data_frame.mesh.is_triangle_mesh
+        # The input mesh is left untouched.
+        assert mesh.num_facets == 1
+        assert generate_scene_config(scene) == scene_config
+
+    def test_point_cloud_covariance_render(self, triangle):
+        triangle.create_attribute(
+            "covariance",
+            element=lagrange.AttributeElement.Vertex,
+            usage=lagrange.AttributeUsage.Vector,
+            initial_values=np.tile((0.1 * np.eye(3)).ravel(), (3, 1)),
+        )
+        base = hkw.layer(triangle).mark(hkw.mark.Point)
+        root = base.channel(covariance=hkw.channel.Covariance(data="covariance"))
+
+        # One ply shape per point, all sharing the same bsdf.
+        scene_config = generate_scene_config(hkw.compiler.compile(root))
+        assert len(scene_config) == 3
+        for shape in scene_config.values():
+            assert shape["type"] == "ply"
+
+        # Actually render the scene.
+        image = np.asarray(hkw.render(root, config=small_config()))
+        assert image.shape == (16, 16, 4)
+        assert np.all(np.isfinite(image))
+        assert image.mean() > 0
+
+    def test_render_import_after_render(self, triangle):
+        root = hkw.layer(triangle).mark(hkw.mark.Surface)
+        hkw.render(root, config=small_config())
+
+        # Loading the render submodule must not shadow the render function of the package.
+        from hakowan.render import render
+
+        assert callable(render)
+        render(root, config=small_config())
+
+        from hakowan.render import render as render_again
+
+        assert render_again is render
+        render_again(root, config=small_config())
+
+    @pytest.mark.parametrize(
+        "variant, dtype",
+        [("scalar_rgb", np.float32), ("scalar_rgb_double", np.float64)],
+    )
+    def test_curve_precision(self, monkeypatch, variant, dtype):
+        monkeypatch.setattr(mi, "variant", lambda: variant)
+        positions = np.full((2, 3), 1 / 3)
+        radii = np.full(2, 2 / 3)
+        filename = _save_curves([(positions, radii), (positions + 1, radii)])
+
+        # Coordinates round trip in the precision of the active variant.
+        values = np.array(filename.read_text().split(), dtype=np.float64)
+        expected = np.array([[1 / 3] * 3 + [2 / 3], [4 / 3] * 3 + [2 / 3]] * 2).ravel()
+        assert np.array_equal(values.astype(dtype), expected.astype(dtype))
+
+    def test_reuse_scene(self, triangle, scene_builds):
+        root = hkw.layer(triangle).mark(hkw.mark.Surface)
+        image = render_image(root, small_config(), reuse_scene=True)
+        reused_image = render_image(root, small_config(), reuse_scene=True)
+        assert len(scene_builds) == 1
+        assert np.array_equal(reused_image, image)
+        assert np.array_equal(reused_image, render_image(root, small_config()))
+
+    def test_reuse_scene_after_layer_change(self, triangle, scene_builds):
+        root = hkw.layer(triangle).mark(hkw.mark.Surface)
+        image = render_image(root, small_config(), reuse_scene=True)
+
+        # Modifying the layer tree invalidates the cached scene.
+        root.channel(size=0.2, in_place=True).mark(hkw.mark.Point, in_place=True)
+        changed_image = render_image(root, small_config(), reuse_scene=True)
+        assert len(scene_builds) == 2
+        assert not np.array_equal(changed_image, image)
+        assert np.array_equal(changed_image, render_image(root, small_config()))
+
+    def test_reuse_scene_after_camera_change(self, triangle, scene_builds):
+        root = hkw.layer(triangle).mark(hkw.mark.Surface)
+        image = render_image(root, small_config(), reuse_scene=True)
+
+        # Sensor settings other than the pose only reload the camera.
+        config = small_config()
+        config.sensor.fov = 40.0
+        zoomed_image = render_image(root, config, reuse_scene=True)
+        assert len(scene_builds) == 1
+        assert not np.array_equal(zoomed_image, image)
+        assert np.array_equal(zoomed_image, render_image(root, config))
+
+    def test_reuse_scene_after_pose_change(self, triangle, scene_builds):
+        root = hkw.layer(triangle).mark(hkw.mark.Surface)
+
+        def camera_config(location=(0, 0, 5), target=(0, 0, 0), fov=28.8415):
+            config = small_config()
+            config.sensor.location = list(location)
+            config.sensor.target = list(target)
+            config.sensor.fov = fov
+            return config
+
+        configs = [
+            camera_config(),
+            # Pose change, which updates the camera transform in place.
+            camera_config(location=(1, 1, 4)),
+            # Non-pose change after a pose change.
+            camera_config(location=(1, 1, 4), fov=40.0),
+            # Back to the original sensor settings at another pose.
+            camera_config(target=(0.2, 0, 0)),
+        ]
+        images = [render_image(root, config, reuse_scene=True) for config in configs]
+        assert len(scene_builds) == 1
+
+        for i, config in enumerate(configs):
+            if i > 0:
+                assert not np.array_equal(images[i], images[i - 1])
+            assert np.array_equal(images[i], render_image(root, config))
+
+    def test_variant_candidates(self):
+        config = hkw.config()
+        assert variant_candidates(config) == ()
+
+        # Workloads below the budget prefer the CPU, and larger ones prefer the GPU.
+        config.variant_policy = "auto"
+        config.film.width = 100
+        config.film.height = 100
+        config.sampler.sample_count = int(GPU_SAMPLE_BUDGET) // 10000 - 1
+        assert variant_candidates(config) == ("scalar_rgb", "llvm_ad_rgb")
+        config.sampler.sample_count += 1
+        assert variant_candidates(config) == (
+            "cuda_ad_rgb",
+            "llvm_ad_rgb",
+            "scalar_rgb",
+        )
+
+    def test_unknown_variant_policy(self):
+        config = hkw.config()
+        config.variant_policy = "automatic"  # type: ignore
+        with pytest.raises(ValueError):
+            variant_candidates(config)
+        with pytest.raises(ValueError):
+            select_variant(config)
+
+    def test_save_temp_file_failure(self, monkeypatch, tmp_path):
+        shape_module = importlib.import_module("hakowan.render.shape")
+        monkeypatch.setattr(shape_module, "_temp_dir", lambda: tmp_path)
+
+        def failing_replace(src, dst):
+            raise OSError("No space left on device")
+
+        monkeypatch.setattr(os, "replace", failing_replace)
+        with pytest.raises(OSError):
+            _save_temp_file(b"content", ".txt")
+        # The private file is removed.
+        assert list(tmp_path.iterdir()) == []
+
+    def test_stream_temp_file_failure(self, monkeypatch, tmp_path):
+        shape_module = importlib.import_module("hakowan.render.shape")
+        monkeypatch.setattr(shape_module, "_temp_dir", lambda: tmp_path)
+
+        def chunks():
+            yield b"content"
+            raise ValueError("Failed to format chunk")
+
+        with pytest.raises(ValueError):
+            _stream_temp_file(chunks(), ".txt")
+        # The private file is removed.
+        assert list(tmp_path.iterdir()) == []
+
+        # Streaming the same content twice reuses the file.
+        first = _stream_temp_file([b"con", b"tent"], ".txt")
+        second = _stream_temp_file([b"content"], ".txt")
+        assert first == second
+        assert list(tmp_path.iterdir()) == [first]
+        assert first.read_bytes() == b"content"
@@ -37,3 +37,29 @@ class TestTransform:
         t = transform.Affine(matrix=np.eye(4))
         assert np.all(t.matrix == np.eye(4))
         assert t._child is None
+
+    def test_slots(self):
+        transforms = [
+            transform.Filter(),
+            transform.UVMesh(),
+            transform.Affine(np.eye(4)),
+            transform.Compute(x="x"),
+            transform.Explode("pieces"),
+            transform.Norm("data", "norm"),
+            transform.Boundary(),
+        ]
+        for t in transforms:
+            assert not hasattr(t, "__dict__")
+
+    def test_chaining_clone(self):
+        t0 = transform.Affine(np.eye(4))
+        t1 = transform.Boundary(attributes=["uv"])
+        t0 *= t1
+        t0 *= transform.UVMesh(uv="uv")
+
+        assert isinstance(t0._child, transform.Boundary)
+        assert t0._child is not t1
+        assert t0._child.attributes == t1.attributes
+        assert t0._child.attributes is not t1.attributes
+        assert isinstance(t0._child._child, transform.UVMesh)
+        assert t1._child is None